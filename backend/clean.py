@@ -60,9 +60,14 @@ def safe_remove_dir(path, description):
         print(f"[SKIP] {description} not found: {path}")
         return True
 
-def safe_remove_file(path, description):
-    """Safely remove a file with proper error handling."""
-    if path.exists():
+def safe_remove_file(path, description, exists=None):
+    """Safely remove a file with proper error handling.
+
+    If ``exists`` is given it is used instead of stat'ing ``path`` again.
+    """
+    if exists is None:
+        exists = path.exists()
+    if exists:
         try:
             path.unlink()
             print(f"[REMOVED] {description}: {path}")
@@ -74,26 +79,13 @@ def safe_remove_file(path, description):
         print(f"[SKIP] {description} not found: {path}")
         return True
 
-def is_installation_in_project(install_info_file):
-    """Check if Lua is installed within the project directory."""
-    if not install_info_file.exists():
-        return False
-
+def _relative_to_project(install_dir):
+    """Return install_dir relative to the project directory, or None if it is outside."""
+    script_dir = Path(__file__).parent.resolve()
     try:
-        script_dir = Path(__file__).parent.resolve()
-        with open(install_info_file, 'r') as f:
-            for line in f:
-                if line.startswith('INSTALL_DIRECTORY='):
-                    install_dir = Path(line.split('=', 1)[1].strip()).resolve()
-                    # Check if install directory is within or same as project directory
-                    try:
-                        install_dir.relative_to(script_dir)
-                        return True
-                    except ValueError:
-                        return False
-        return False
-    except Exception:
-        return False
+        return install_dir.resolve().relative_to(script_dir)
+    except (ValueError, OSError):
+        return None
 
 def clean_downloads():
     """Remove downloads directory."""
@@ -138,10 +130,10 @@ def clean_cache_and_temp():
     return success
 
 def get_installation_directory(install_info_file):
-    """Get the installation directory from the install info file."""
-    if not install_info_file.exists():
-        return None
+    """Get the installation directory from the install info file.
 
+    Returns None if the file is missing, unreadable or has no directory entry.
+    """
     try:
         with open(install_info_file, 'r') as f:
             for line in f:
@@ -159,26 +151,47 @@ def clean_installation_files():
     install_info_file = script_dir / ".lua_install_info.txt"
     prefix_file = script_dir / ".lua_prefix.txt"
 
-    # Check if installation is in project directory
-    install_in_project = is_installation_in_project(install_info_file)
-    install_dir = get_installation_directory(install_info_file)
+    # Both tracking files live in the script directory, and so does an
+    # installation made directly under it, so a single directory listing
+    # answers the existence checks below
+    present_files = set()
+    present_dirs = set()
+    try:
+        with os.scandir(script_dir) as entries:
+            for entry in entries:
+                (present_dirs if entry.is_dir() else present_files).add(entry.name)
+    except OSError:
+        pass
+    info_exists = install_info_file.name in present_files
+    prefix_exists = prefix_file.name in present_files
+
+    # The info file is the single source of truth; parse it once
+    install_dir = get_installation_directory(install_info_file) if info_exists else None
+    relative_install_dir = _relative_to_project(install_dir) if install_dir else None
+    install_in_project = relative_install_dir is not None
 
     if install_in_project and install_dir:
         print(f"[DETECTED] Lua installation in project directory: {install_dir}")
 
+        # Only a nested installation directory needs its own existence check
+        if len(relative_install_dir.parts) == 1:
+            install_exists = relative_install_dir.name in present_dirs
+        else:
+            install_exists = install_dir.exists()
+
         # Remove the actual installation directory
-        if install_dir.exists():
+        if install_exists:
             success &= safe_remove_dir(install_dir, f"Lua installation directory")
 
         # Remove installation tracking files
-        success &= safe_remove_file(install_info_file, "Installation info file")
-        success &= safe_remove_file(prefix_file, "Prefix file")
+        success &= safe_remove_file(install_info_file, "Installation info file", info_exists)
+        success &= safe_remove_file(prefix_file, "Prefix file", prefix_exists)
 
         print("[INFO] Removed installation and tracking files from project directory.")
     else:
         # Only remove tracking files if installation is external
-        success &= safe_remove_file(install_info_file, "Installation info file")
-        success &= safe_remove_file(prefix_file, "Prefix file")
+        success &= safe_remove_file(install_info_file, "Installation info file", info_exists)
+        success &= safe_remove_file(prefix_file, "Prefix file", prefix_exists)
 
         if install_dir and not install_in_project:
             print(f"[INFO] External installation at {install_dir} was not removed.")
@@ -11,6 +11,7 @@ The scripts use the versions specified in build_config.txt
 """
 
 import os
+import sys
 from pathlib import Path
 import urllib.request
 import urllib.error
@@ -129,8 +130,7 @@ def load_version_cache(show_message=True):
         return {}
 
     try:
-        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-            cache = json.load(f)
+        cache = json.loads(CACHE_FILE.read_bytes())
 
         # Check if cache is expired
         cache_time = datetime.fromisoformat(cache.get('timestamp', '1970-01-01T00:00:00'))
@@ -153,11 +153,14 @@ def load_version_cache(show_message=True):
             _cache_message_shown = True
         return {}
 
-def save_version_cache(lua_versions, luarocks_versions):
-    """Save version information to cache."""
+def save_version_cache(lua_versions, luarocks_versions, timestamp=None):
+    """Save version information to cache.
+
+    timestamp is an ISO format string; it defaults to the current time.
+    """
     try:
         cache_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'lua_versions': lua_versions,
             'luarocks_versions': luarocks_versions,
             'cache_expiry_hours': CACHE_EXPIRY_HOURS
@@ -184,6 +187,20 @@ def clear_version_cache():
 
 def get_cached_versions(show_message=True):
     """Get versions from cache if available."""
+    global _cache_message_shown
+
+    # The cache timestamp is written no later than the file's mtime, so a file
+    # whose mtime is already past the expiry window is stale without parsing it
+    try:
+        cache_mtime = CACHE_FILE.stat().st_mtime
+    except OSError:
+        return [], {}, False
+    if time.time() - cache_mtime > CACHE_EXPIRY_HOURS * 3600:
+        if show_message and not _cache_message_shown:
+            print(f"[INFO] Version cache expired (older than {CACHE_EXPIRY_HOURS} hours)")
+            _cache_message_shown = True
+        return [], {}, False
+
     cache = load_version_cache(show_message=show_message)
 
     if cache and 'lua_versions' in cache and 'luarocks_versions' in cache:
@@ -411,12 +428,44 @@ def discover_and_cache_versions(force_refresh=False, quiet=False, use_stderr=Fal
 
     return lua_versions, luarocks_versions
 
-if __name__ == "__main__":
-    import sys
+# Static --help text, built once at import time
+_HELP_TEXT = "\n".join([
+    "Lua MSVC Build System Configuration",
+    "Usage:",
+    "  python config.py                             # Show current configuration",
+    "  python config.py --check                     # Validate current download URLs",
+    "  python config.py --discover                  # Discover available versions (use cache)",
+    "  python config.py --discover --refresh        # Discover versions (refresh cache)",
+    "  python config.py --discover --json           # Output version data as JSON",
+    "  python config.py --discover --json --refresh # JSON output with fresh data",
+    "  python config.py --cache-info                # Show cache information",
+    "  python config.py --clear-cache               # Clear version cache",
+    "  python config.py --help                      # Show this help",
+    "",
+    "Cache Management:",
+    f"  - Cache expires after {CACHE_EXPIRY_HOURS} hours",
+    "  - Use --refresh to force cache update",
+    "  - Cache reduces server load and improves performance",
+    "",
+    "JSON Output:",
+    "  - Use --json flag for structured output (for CLI integration)",
+    "  - Includes cache info, URLs, and all available versions",
+    "  - Combine with --refresh for fresh data",
+    "",
+    "To change versions, edit build_config.txt",
+])
+
+def main(argv=None):
+    """Command line entry point; returns the process exit code.
+
+    argv defaults to sys.argv[1:], so tests can call main() in-process.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
 
     # Check for command line arguments
-    if len(sys.argv) > 1:
-        if sys.argv[1] in ['--check', '-c']:
+    if argv:
+        if argv[0] in ['--check', '-c']:
             print("Lua MSVC Build System - URL Validation")
             print("=" * 50)
             all_valid, results = validate_current_configuration()
@@ -430,11 +479,11 @@ if __name__ == "__main__":
                         print(f"  - {name}: {result['message']}")
                 print()
                 print("Consider checking build_config.txt for correct versions")
-            sys.exit(0)
+            return 0
 
-        elif sys.argv[1] in ['--discover', '-d']:
-            force_refresh = '--refresh' in sys.argv or '-r' in sys.argv
-            json_output = '--json' in sys.argv
+        elif argv[0] in ['--discover', '-d']:
+            force_refresh = '--refresh' in argv or '-r' in argv
+            json_output = '--json' in argv
 
             if json_output:
                 # JSON output for programmatic consumption (CLI)
@@ -482,7 +531,7 @@ if __name__ == "__main__":
                 }
 
                 print(json.dumps(output, indent=2))
-                sys.exit(0)
+                return 0
             else:
                 # Human-readable output for direct use
                 print("Lua MSVC Build System - Version Discovery")
@@ -528,14 +577,14 @@ if __name__ == "__main__":
                 print("To use a different version, edit build_config.txt")
                 if CACHE_FILE.exists():
                     print(f"Cache file: {CACHE_FILE}")
-                sys.exit(0)
+                return 0
 
-        elif sys.argv[1] in ['--clear-cache']:
+        elif argv[0] in ['--clear-cache']:
             print("Clearing version cache...")
             clear_version_cache()
-            sys.exit(0)
+            return 0
 
-        elif sys.argv[1] in ['--cache-info']:
+        elif argv[0] in ['--cache-info']:
             cache = load_version_cache()
             if not cache:
                 print("No cache file found")
@@ -556,33 +605,11 @@ if __name__ == "__main__":
                 luarocks = cache.get('luarocks_versions', {})
                 for platform, versions in luarocks.items():
                     print(f"Cached LuaRocks ({platform}): {len(versions)}")
-            sys.exit(0)
-
-        elif sys.argv[1] in ['--help', '-h']:
-            print("Lua MSVC Build System Configuration")
-            print("Usage:")
-            print("  python config.py                             # Show current configuration")
-            print("  python config.py --check                     # Validate current download URLs")
-            print("  python config.py --discover                  # Discover available versions (use cache)")
-            print("  python config.py --discover --refresh        # Discover versions (refresh cache)")
-            print("  python config.py --discover --json           # Output version data as JSON")
-            print("  python config.py --discover --json --refresh # JSON output with fresh data")
-            print("  python config.py --cache-info                # Show cache information")
-            print("  python config.py --clear-cache               # Clear version cache")
-            print("  python config.py --help                      # Show this help")
-            print()
-            print("Cache Management:")
-            print(f"  - Cache expires after {CACHE_EXPIRY_HOURS} hours")
-            print("  - Use --refresh to force cache update")
-            print("  - Cache reduces server load and improves performance")
-            print()
-            print("JSON Output:")
-            print("  - Use --json flag for structured output (for CLI integration)")
-            print("  - Includes cache info, URLs, and all available versions")
-            print("  - Combine with --refresh for fresh data")
-            print()
-            print("To change versions, edit build_config.txt")
-            sys.exit(0)
+            return 0
+
+        elif argv[0] in ['--help', '-h']:
+            print(_HELP_TEXT)
+            return 0
 
     # Default behavior - show current configuration
     print("Lua MSVC Build System Configuration")
@@ -616,3 +643,8 @@ if __name__ == "__main__":
     print()
     print("To change versions, edit build_config.txt")
     print("Use 'python config.py --help' for more options")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
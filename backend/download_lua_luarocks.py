@@ -52,6 +52,38 @@ except ImportError:
         print("Make sure utils.py and download_manager.py are in the same directory as this script.")
         sys.exit(1)
 
+# Static --help text, built once at import time
+_HELP_TEXT = "\n".join([
+    "Lua MSVC Build - Download Script",
+    "Usage:",
+    "  python download_lua_luarocks.py               # Download and extract files",
+    "  python download_lua_luarocks.py --config      # Show current configuration",
+    "  python download_lua_luarocks.py --list        # List downloaded versions",
+    "  python download_lua_luarocks.py --cleanup     # Clean up old downloads (keep 3)",
+    "  python download_lua_luarocks.py --cleanup --all  # Clean up all but latest",
+    "  python download_lua_luarocks.py --info        # Show registry information",
+    "  python download_lua_luarocks.py --help        # Show this help",
+    "",
+    "Extraction Management:",
+    "  python download_lua_luarocks.py --list-extracted  # List extracted contents",
+    "  python download_lua_luarocks.py --clean-extracted # Clean extracted folder",
+    "  python download_lua_luarocks.py --clean-extracted --force  # Clean without confirmation",
+    "  python download_lua_luarocks.py --re-extract  # Re-extract current version",
+    "",
+    "Version Management:",
+    "  Edit build_config.txt to customize versions",
+    "  python config.py --discover     # Find available versions (uses cache)",
+    "  python config.py --check        # Validate current URLs",
+    "  python config.py --cache-info   # Show cache status",
+    "",
+    "Download Management:",
+    "  - Downloads are organized by version (lua-X.X.X_luarocks-X.X.X)",
+    "  - Avoids re-downloading existing versions",
+    "  - Maintains a registry of downloaded versions",
+    "  - Supports cleanup of old downloads to save space",
+    "  - Extracts to 'extracted' folder for build isolation",
+])
+
 def download():
     """Download Lua and LuaRocks using the version-aware download manager."""
     # Check version compatibility first
@@ -154,6 +186,35 @@ def create_extraction_callback():
     return move_callback
 
 
+def run():
+    """
+    Download and extract the configured Lua and LuaRocks versions.
+
+    This is the default action of the script, exposed so other backend
+    scripts can run it in-process. Returns True on success, False if the
+    extraction failed.
+    """
+    download_manager = download()
+    callback = create_extraction_callback()
+
+    # Extract the downloaded files
+    success, message = download_manager.extract_version(
+        LUA_VERSION, LUAROCKS_VERSION, move_callback=callback, platform=LUAROCKS_PLATFORM
+    )
+
+    if success:
+        print(f"[OK] {message}")
+        print(f"\nExtracted to extracted folder:")
+        extracted_folder = ensure_extracted_folder()
+        print(f"  - Lua source: {extracted_folder / get_lua_dir_name()}")
+        print(f"  - Lua tests: {extracted_folder / get_lua_tests_dir_name()}")
+        print(f"  - LuaRocks: {extracted_folder / get_luarocks_dir_name()}")
+        return True
+
+    print(f"[ERROR] {message}")
+    return False
+
+
 def main():
     """Main entry point for the script."""
     # Check for command line arguments
@@ -281,54 +342,11 @@ def main():
             sys.exit(0)
 
         elif sys.argv[1] in ['--help', '-h']:
-            print("Lua MSVC Build - Download Script")
-            print("Usage:")
-            print("  python download_lua_luarocks.py               # Download and extract files")
-            print("  python download_lua_luarocks.py --config      # Show current configuration")
-            print("  python download_lua_luarocks.py --list        # List downloaded versions")
-            print("  python download_lua_luarocks.py --cleanup     # Clean up old downloads (keep 3)")
-            print("  python download_lua_luarocks.py --cleanup --all  # Clean up all but latest")
-            print("  python download_lua_luarocks.py --info        # Show registry information")
-            print("  python download_lua_luarocks.py --help        # Show this help")
-            print()
-            print("Extraction Management:")
-            print("  python download_lua_luarocks.py --list-extracted  # List extracted contents")
-            print("  python download_lua_luarocks.py --clean-extracted # Clean extracted folder")
-            print("  python download_lua_luarocks.py --clean-extracted --force  # Clean without confirmation")
-            print("  python download_lua_luarocks.py --re-extract  # Re-extract current version")
-            print()
-            print("Version Management:")
-            print("  Edit build_config.txt to customize versions")
-            print("  python config.py --discover     # Find available versions (uses cache)")
-            print("  python config.py --check        # Validate current URLs")
-            print("  python config.py --cache-info   # Show cache status")
-            print()
-            print("Download Management:")
-            print("  - Downloads are organized by version (lua-X.X.X_luarocks-X.X.X)")
-            print("  - Avoids re-downloading existing versions")
-            print("  - Maintains a registry of downloaded versions")
-            print("  - Supports cleanup of old downloads to save space")
-            print("  - Extracts to 'extracted' folder for build isolation")
+            print(_HELP_TEXT)
             sys.exit(0)
 
     # Normal download and extract process
-    download_manager = download()
-    callback = create_extraction_callback()
-
-    # Extract the downloaded files
-    success, message = download_manager.extract_version(
-        LUA_VERSION, LUAROCKS_VERSION, move_callback=callback, platform=LUAROCKS_PLATFORM
-    )
-
-    if success:
-        print(f"[OK] {message}")
-        print(f"\nExtracted to extracted folder:")
-        extracted_folder = ensure_extracted_folder()
-        print(f"  - Lua source: {extracted_folder / get_lua_dir_name()}")
-        print(f"  - Lua tests: {extracted_folder / get_lua_tests_dir_name()}")
-        print(f"  - LuaRocks: {extracted_folder / get_luarocks_dir_name()}")
-    else:
-        print(f"[ERROR] {message}")
+    if not run():
         sys.exit(1)
 
 
@@ -7,10 +7,13 @@ This module manages downloads by version, avoiding re-downloads and maintaining
 a registry of available versions.
 """
 
+import functools
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 
 # Add current directory to Python path for local imports
@@ -19,55 +22,122 @@ sys.path.insert(0, str(current_dir))
 
 # Import utilities with dual-context support
 try:
-    from .utils import download_file, extract_file, verify_file_exists, get_file_size, format_file_size
+    from .utils import (download_file, extract_file, list_nonempty_files, get_file_size,
+                        format_file_size, atomic_write_text)
 except ImportError:
-    from utils import download_file, extract_file, verify_file_exists, get_file_size, format_file_size
+    from utils import (download_file, extract_file, list_nonempty_files, get_file_size,
+                       format_file_size, atomic_write_text)
 
 
 class DownloadManager:
     """Manages version-aware downloads with caching and registry."""
 
+    # Layout of a new registry, built once; _new_registry() copies it
+    _DEFAULT_REGISTRY = MappingProxyType({
+        "version": "2.0",  # Updated version for new structure
+        "lua_downloads": {},      # Lua + Lua tests downloads
+        "luarocks_downloads": {}, # LuaRocks downloads
+        "combinations": {}        # Version combinations
+    })
+    _REGISTRY_SECTIONS = ("lua_downloads", "luarocks_downloads", "combinations")
+
     def __init__(self, base_downloads_dir="downloads"):
         self.base_dir = Path(base_downloads_dir)
         self.lua_dir = self.base_dir / "lua"
         self.luarocks_dir = self.base_dir / "luarocks"
         self.registry_file = self.base_dir / "download_registry.json"
+        # Version directory paths, built once per version
+        self._lua_dirs: Dict[str, Path] = {}
+        self._luarocks_dirs: Dict[Tuple[str, str], Path] = {}
         self.registry = self._load_registry()
 
     def _load_registry(self) -> Dict:
         """Load the download registry from disk."""
         if self.registry_file.exists():
             try:
-                with open(self.registry_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
+                # One read and one parse of the whole file
+                registry = json.loads(self.registry_file.read_bytes())
+            except (ValueError, OSError):
                 pass
-
-        return {
-            "version": "2.0",  # Updated version for new structure
-            "created": datetime.now().isoformat(),
-            "lua_downloads": {},      # Lua + Lua tests downloads
-            "luarocks_downloads": {}, # LuaRocks downloads
-            "combinations": {}        # Version combinations
-        }
-
-    def _save_registry(self):
-        """Save the download registry to disk."""
+            else:
+                if isinstance(registry, dict):
+                    # Older or hand-edited files may lack a section
+                    for section in self._REGISTRY_SECTIONS:
+                        registry.setdefault(section, {})
+                    return self._intern_registry(registry)
+
+        return self._new_registry()
+
+    def _new_registry(self) -> Dict:
+        """Return an empty registry in the _DEFAULT_REGISTRY layout."""
+        registry = {key: (value.copy() if isinstance(value, dict) else value)
+                    for key, value in self._DEFAULT_REGISTRY.items()}
+        registry["created"] = datetime.now().isoformat()
+        return registry
+
+    # Entry fields whose values repeat across the registry
+    _INTERNED_FIELDS = ("filename", "platform", "lua_version", "luarocks_version")
+
+    def _intern_registry(self, registry: Dict) -> Dict:
+        """Intern the version keys and repeated values of a loaded registry.
+
+        The same version and file name strings appear under several
+        sections; interning lets them share one object each, and lookups
+        with interned keys can match by identity.
+        """
+        for section in self._REGISTRY_SECTIONS:
+            entries = registry.get(section)
+            if not isinstance(entries, dict):
+                continue
+            interned = {}
+            for key, entry in entries.items():
+                if isinstance(entry, dict):
+                    self._intern_fields(entry)
+                    for file_info in entry.get("files", {}).values():
+                        if isinstance(file_info, dict):
+                            self._intern_fields(file_info)
+                interned[sys.intern(key)] = entry
+            registry[section] = interned
+        return registry
+
+    def _intern_fields(self, entry: Dict):
+        """Intern the string values of the _INTERNED_FIELDS in entry."""
+        for field in self._INTERNED_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, str):
+                entry[field] = sys.intern(value)
+
+    def _save_registry(self, timestamp: Optional[str] = None):
+        """Save the download registry to disk.
+
+        timestamp is the ISO time recorded as last_updated; callers that
+        already took one for the operation pass it in (default: now).
+        """
         self.base_dir.mkdir(exist_ok=True)
-        self.registry["last_updated"] = datetime.now().isoformat()
+        self.registry["last_updated"] = timestamp or datetime.now().isoformat()
 
-        with open(self.registry_file, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+        # Serialize up front so the file gets a single write, and replace it
+        # atomically so an interrupted save never leaves a truncated registry
+        atomic_write_text(self.registry_file, json.dumps(self.registry, indent=2))
 
     def get_lua_dir(self, lua_version: str) -> Path:
         """Get the directory for a specific Lua version."""
-        return self.lua_dir / f"lua-{lua_version}"
+        lua_dir = self._lua_dirs.get(lua_version)
+        if lua_dir is None:
+            lua_dir = self._lua_dirs[lua_version] = self.lua_dir / f"lua-{lua_version}"
+        return lua_dir
 
     def get_luarocks_dir(self, luarocks_version: str, platform: str) -> Path:
         """Get the directory for a specific LuaRocks version."""
-        return self.luarocks_dir / f"luarocks-{luarocks_version}-{platform}"
-
-    def get_version_key(self, lua_version: str, luarocks_version: str) -> str:
+        key = (luarocks_version, platform)
+        luarocks_dir = self._luarocks_dirs.get(key)
+        if luarocks_dir is None:
+            luarocks_dir = self._luarocks_dirs[key] = self.luarocks_dir / f"luarocks-{luarocks_version}-{platform}"
+        return luarocks_dir
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def get_version_key(lua_version: str, luarocks_version: str) -> str:
         """Get the registry key for a version combination."""
         return f"lua-{lua_version}_luarocks-{luarocks_version}"
 
@@ -77,15 +147,9 @@ class DownloadManager:
             return False
 
         lua_info = self.registry["lua_downloads"][lua_version]
-        lua_dir = self.get_lua_dir(lua_version)
 
         # Check if all Lua files exist and are not empty
-        for file_type, file_info in lua_info.get("files", {}).items():
-            file_path = lua_dir / file_info["filename"]
-            if not verify_file_exists(file_path):
-                return False
-
-        return True
+        return self._files_present(self.get_lua_dir(lua_version), lua_info.get("files", {}))
 
     def is_luarocks_downloaded(self, luarocks_version: str, platform: str) -> bool:
         """Check if a LuaRocks version is already downloaded."""
@@ -94,15 +158,19 @@ class DownloadManager:
             return False
 
         luarocks_info = self.registry["luarocks_downloads"][luarocks_key]
-        luarocks_dir = self.get_luarocks_dir(luarocks_version, platform)
 
         # Check if LuaRocks file exists and is not empty
-        for file_type, file_info in luarocks_info.get("files", {}).items():
-            file_path = luarocks_dir / file_info["filename"]
-            if not verify_file_exists(file_path):
-                return False
+        return self._files_present(self.get_luarocks_dir(luarocks_version, platform),
+                                   luarocks_info.get("files", {}))
 
-        return True
+    def _files_present(self, directory: Path, files: Dict) -> bool:
+        """Check that every file of a registry entry exists in directory and is not empty."""
+        if not files:
+            return True
+
+        # One directory listing answers the check for every file
+        present = list_nonempty_files(directory)
+        return all(file_info["filename"] in present for file_info in files.values())
 
     def is_downloaded(self, lua_version: str, luarocks_version: str, platform: str = "windows-64") -> bool:
         """Check if a version combination is already downloaded."""
@@ -128,6 +196,10 @@ class DownloadManager:
         version_key = self.get_version_key(lua_version, luarocks_version)
         luarocks_key = f"{luarocks_version}-{platform}"
 
+        # One timestamp for the registry entries of this operation; the
+        # per-file "downloaded" times are still taken as each file finishes
+        timestamp = datetime.now().isoformat()
+
         # Check what needs to be downloaded
         lua_needs_download = not self.is_lua_downloaded(lua_version)
         luarocks_needs_download = not self.is_luarocks_downloaded(luarocks_version, platform)
@@ -139,12 +211,16 @@ class DownloadManager:
                     "lua_version": lua_version,
                     "luarocks_version": luarocks_version,
                     "platform": platform,
-                    "created": datetime.now().isoformat()
+                    "created": timestamp
                 }
-                self._save_registry()
+                self._save_registry(timestamp)
             return True, f"Version {version_key} already downloaded"
 
         try:
+            # Plan every file to fetch as (files dict of its registry entry,
+            # file type, filename, destination path)
+            jobs = []
+
             # Download Lua components if needed
             if lua_needs_download:
                 lua_dir = self.get_lua_dir(lua_version)
@@ -152,7 +228,7 @@ class DownloadManager:
 
                 lua_info = {
                     "lua_version": lua_version,
-                    "download_date": datetime.now().isoformat(),
+                    "download_date": timestamp,
                     "files": {}
                 }
 
@@ -160,20 +236,8 @@ class DownloadManager:
                 for file_type in ['lua', 'lua_tests']:
                     if file_type in urls and file_type in filenames:
                         filename = filenames[file_type]
-                        file_path = lua_dir / filename
-
                         print(f"  Downloading {file_type}: {filename}")
-                        download_file(urls[file_type], str(file_path))
-
-                        lua_info["files"][file_type] = {
-                            "filename": filename,
-                            "url": urls[file_type],
-                            "size": get_file_size(file_path),
-                            "downloaded": datetime.now().isoformat()
-                        }
-
-                # Update registry
-                self.registry["lua_downloads"][lua_version] = lua_info
+                        jobs.append((lua_info["files"], file_type, filename, lua_dir / filename))
             else:
                 print(f"[OK] Lua {lua_version} already downloaded, skipping...")
 
@@ -185,39 +249,52 @@ class DownloadManager:
                 luarocks_info = {
                     "luarocks_version": luarocks_version,
                     "platform": platform,
-                    "download_date": datetime.now().isoformat(),
+                    "download_date": timestamp,
                     "files": {}
                 }
 
                 print(f"Downloading LuaRocks {luarocks_version}-{platform}...")
                 if 'luarocks' in urls and 'luarocks' in filenames:
                     filename = filenames['luarocks']
-                    file_path = luarocks_dir / filename
-
                     print(f"  Downloading luarocks: {filename}")
-                    download_file(urls['luarocks'], str(file_path))
+                    jobs.append((luarocks_info["files"], 'luarocks', filename, luarocks_dir / filename))
+            else:
+                print(f"[OK] LuaRocks {luarocks_version}-{platform} already downloaded, skipping...")
 
-                    luarocks_info["files"]['luarocks'] = {
+            # The downloads are independent and network-bound, so overlap
+            # them; the first failure is re-raised once all have finished
+            if jobs:
+                def fetch(job):
+                    _, file_type, _, file_path = job
+                    download_file(urls[file_type], str(file_path))
+                    return datetime.now().isoformat()
+
+                with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+                    finished = list(executor.map(fetch, jobs))
+
+                for (files, file_type, filename, file_path), downloaded in zip(jobs, finished):
+                    files[file_type] = {
                         "filename": filename,
-                        "url": urls['luarocks'],
+                        "url": urls[file_type],
                         "size": get_file_size(file_path),
-                        "downloaded": datetime.now().isoformat()
+                        "downloaded": downloaded
                     }
 
-                # Update registry
+            # Update registry
+            if lua_needs_download:
+                self.registry["lua_downloads"][lua_version] = lua_info
+            if luarocks_needs_download:
                 self.registry["luarocks_downloads"][luarocks_key] = luarocks_info
-            else:
-                print(f"[OK] LuaRocks {luarocks_version}-{platform} already downloaded, skipping...")
 
             # Register the combination
             self.registry["combinations"][version_key] = {
                 "lua_version": lua_version,
                 "luarocks_version": luarocks_version,
                 "platform": platform,
-                "created": datetime.now().isoformat()
+                "created": timestamp
             }
 
-            self._save_registry()
+            self._save_registry(timestamp)
             return True, f"Successfully downloaded {version_key}"
 
         except Exception as e:
@@ -317,6 +394,14 @@ class DownloadManager:
     def cleanup_version(self, lua_version: str, luarocks_version: str, platform: str = "windows-64") -> Tuple[bool, str]:
         """Remove downloaded files for a specific version combination."""
         version_key = self.get_version_key(lua_version, luarocks_version)
+        luarocks_key = f"{luarocks_version}-{platform}"
+
+        # Nothing registered under any of the keys: answer from memory,
+        # without touching the disk or rewriting the registry
+        if (version_key not in self.registry["combinations"]
+                and lua_version not in self.registry["lua_downloads"]
+                and luarocks_key not in self.registry["luarocks_downloads"]):
+            return True, f"Nothing to clean up for {version_key}"
 
         try:
             # Remove from combinations registry
@@ -339,7 +424,6 @@ class DownloadManager:
                 del self.registry["lua_downloads"][lua_version]
 
             # Check if this was the last combination using this LuaRocks version
-            luarocks_key = f"{luarocks_version}-{platform}"
             luarocks_still_used = any(
                 combo["luarocks_version"] == luarocks_version and combo.get("platform", "windows-64") == platform
                 for combo in self.registry["combinations"].values()
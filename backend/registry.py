@@ -27,10 +27,10 @@ if __name__ == "__main__" or "backend" not in sys.path:
 
 # Import utilities with dual-context support
 try:
-    from utils import get_backend_dir, print_error
+    from utils import get_backend_dir, print_error, fast_rmtree, ask_yes_no, atomic_write_text
 except ImportError:
     try:
-        from .utils import get_backend_dir, print_error
+        from .utils import get_backend_dir, print_error, fast_rmtree, ask_yes_no, atomic_write_text
     except ImportError as e:
         print(f"Error importing utilities: {e}")
         print("Make sure utils.py is in the same directory as this script.")
@@ -91,10 +91,11 @@ class LuaEnvRegistry:
                 print("[INFO] Creating new registry")
 
         # Create new registry
+        now = datetime.now(timezone.utc).isoformat()
         return {
             "registry_version": self.REGISTRY_VERSION,
-            "created": datetime.now(timezone.utc).isoformat(),
-            "updated": datetime.now(timezone.utc).isoformat(),
+            "created": now,
+            "updated": now,
             "default_installation": None,
             "installations": {},
             "aliases": {}
@@ -110,9 +111,9 @@ class LuaEnvRegistry:
         # Update timestamp
         self.registry["updated"] = datetime.now(timezone.utc).isoformat()
 
-        # Save registry
-        with open(self.registry_path, 'w', encoding='utf-8') as f:
-            json.dump(self.registry, f, indent=2, ensure_ascii=False)
+        # Save registry atomically so an interrupted write cannot truncate it
+        atomic_write_text(self.registry_path,
+                          json.dumps(self.registry, indent=2, ensure_ascii=False))
 
     def generate_installation_id(self) -> str:
         """Generate new UUID4 for installation."""
@@ -343,8 +344,7 @@ class LuaEnvRegistry:
         installation_id = installation["id"]
 
         if confirm:
-            response = input(f"Remove installation '{installation['name']}' ({installation_id})? [y/N]: ")
-            if response.lower() != 'y':
+            if not ask_yes_no(f"Remove installation '{installation['name']}' ({installation_id})? [y/N]: "):
                 print("[INFO] Removal cancelled")
                 return False
 
@@ -353,11 +353,11 @@ class LuaEnvRegistry:
         env_path = Path(installation["environment_path"])
 
         if install_path.exists():
-            shutil.rmtree(install_path)
+            fast_rmtree(install_path)
             print(f"[OK] Removed installation directory: {install_path}")
 
         if env_path.exists():
-            shutil.rmtree(env_path)
+            fast_rmtree(env_path)
             print(f"[OK] Removed environment directory: {env_path}")
 
         # Remove from registry
@@ -540,8 +540,7 @@ class LuaEnvRegistry:
             print(f"  - {installation['name']} ({installation_id})")
 
         if confirm:
-            response = input(f"Remove {len(to_remove)} broken installations? [y/N]: ")
-            if response.lower() != 'y':
+            if not ask_yes_no(f"Remove {len(to_remove)} broken installations? [y/N]: "):
                 print("[INFO] Cleanup cancelled")
                 return 0
 
@@ -585,15 +584,14 @@ class LuaEnvRegistry:
             print(f"  - {zombie_type}: {zombie_path}")
 
         if confirm:
-            response = input(f"Remove all {len(zombies)} zombie directories? [y/N]: ")
-            if response.lower() != 'y':
+            if not ask_yes_no(f"Remove all {len(zombies)} zombie directories? [y/N]: "):
                 print("[INFO] Cleanup cancelled")
                 return 0
 
         cleaned = 0
         for zombie_type, zombie_path in zombies:
             try:
-                shutil.rmtree(zombie_path)
+                fast_rmtree(zombie_path)
                 print(f"[OK] Removed zombie {zombie_type}: {zombie_path}")
                 cleaned += 1
             except Exception as e:
@@ -942,7 +940,7 @@ def main():
     # Remove command
     remove_parser = subparsers.add_parser('remove', help='Remove installation')
     remove_parser.add_argument('id_or_alias', help='Installation ID or alias')
-    remove_parser.add_argument('--yes', action='store_true', help='Skip confirmation')
+    remove_parser.add_argument('--yes', '-y', action='store_true', help='Skip confirmation')
 
     # Alias commands
     alias_parser = subparsers.add_parser('alias', help='Manage aliases')
@@ -964,7 +962,7 @@ def main():
 
     # Cleanup command
     cleanup_parser = subparsers.add_parser('cleanup', help='Clean up broken installations')
-    cleanup_parser.add_argument('--yes', action='store_true', help='Skip confirmation')
+    cleanup_parser.add_argument('--yes', '-y', action='store_true', help='Skip confirmation')
 
     # Install scripts command
     install_scripts_parser = subparsers.add_parser('install-scripts', help='Install LuaEnv scripts')
@@ -9,7 +9,6 @@ to work with any Lua/LuaRocks versions in an isolated build environment.
 """
 
 import os
-import shutil
 import sys
 from pathlib import Path
 
@@ -23,24 +22,68 @@ try:
         get_lua_dir_name, get_luarocks_dir_name,
         LUA_VERSION, LUAROCKS_VERSION, LUAROCKS_PLATFORM
     )
-    from .utils import ensure_extracted_folder
+    from .utils import ensure_extracted_folder, fast_copy
 except ImportError:
     from config import (
         get_lua_dir_name, get_luarocks_dir_name,
         LUA_VERSION, LUAROCKS_VERSION, LUAROCKS_PLATFORM
     )
-    from utils import ensure_extracted_folder
+    from utils import ensure_extracted_folder, fast_copy
 
 BUILD_DLL = 0
 BUILD_DEBUG = 0
 
-def copy_build_scripts():
-    """Copy build scripts to the lua and luarocks directories in the extracted folder."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    build_scripts_dir = os.path.join(current_dir, "build_scripts")
+# Absolute backend paths, resolved once rather than on every call
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD_SCRIPTS_DIR = Path(SCRIPT_DIR) / "build_scripts"
+
+# Scripts copied into the Lua source directory, keyed by (build_dll, build_debug)
+LUA_BUILD_SCRIPTS = {
+    (False, False): ["build-static.bat"],
+    (True, False): ["build-dll.bat", "install_lua_dll.py"],
+    (False, True): ["build-static-debug.bat"],
+    (True, True): ["build-dll-debug.bat", "install_lua_dll.py"],
+}
+
+# Script copied into the LuaRocks directory for every build type
+LUAROCKS_SETUP_SCRIPT = "setup-luarocks.bat"
+
+def _subdirectories(path):
+    """Return the names of the subdirectories of path (empty if unreadable)."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries if entry.is_dir()}
+    except OSError:
+        return set()
+
+def _staged_copy(src, dest_dir):
+    """Copy src into dest_dir via a temporary file and an atomic os.replace.
+
+    An interrupted copy never leaves a truncated script behind.
+    """
+    dest = Path(dest_dir) / Path(src).name
+    tmp_dest = dest.with_name(dest.name + ".tmp")
+    try:
+        fast_copy(src, tmp_dest)
+        os.replace(tmp_dest, dest)
+    except BaseException:
+        tmp_dest.unlink(missing_ok=True)
+        raise
+    return dest
+
+def copy_build_scripts(build_dll=None, build_debug=None):
+    """Copy build scripts to the lua and luarocks directories in the extracted folder.
+
+    build_dll and build_debug default to the module-level BUILD_DLL and
+    BUILD_DEBUG flags set by the command line.
+    """
+    if build_dll is None:
+        build_dll = BUILD_DLL
+    if build_debug is None:
+        build_debug = BUILD_DEBUG
 
     # Ensure extracted folder exists
-    extracted_folder = ensure_extracted_folder(current_dir)
+    extracted_folder = ensure_extracted_folder(SCRIPT_DIR)
 
     # Use configuration to get correct directory names
     lua_dir_name = get_lua_dir_name()
@@ -56,110 +99,117 @@ def copy_build_scripts():
     print(f"  Extracted folder: {extracted_folder}")
 
     # Show selected build type
-    if BUILD_DLL and BUILD_DEBUG:
+    if build_dll and build_debug:
         build_type = "DLL Debug"
-    elif BUILD_DLL:
+    elif build_dll:
         build_type = "DLL Release"
-    elif BUILD_DEBUG:
+    elif build_debug:
         build_type = "Static Debug"
     else:
         build_type = "Static Release"
     print(f"  Build type: {build_type}")
     print()
 
+    # One directory listing per level answers all of the existence checks
+    backend_dirs = _subdirectories(SCRIPT_DIR)
+    extracted_dirs = _subdirectories(extracted_folder)
+
     # Ensure the build scripts directory exists
-    if not os.path.exists(build_scripts_dir):
-        print(f"[ERROR] Build scripts directory does not exist: {build_scripts_dir}")
+    if BUILD_SCRIPTS_DIR.name not in backend_dirs:
+        print(f"[ERROR] Build scripts directory does not exist: {BUILD_SCRIPTS_DIR}")
         print("        Make sure the build_scripts folder exists in the project root.")
         return False
 
     # Ensure the target directories exist
-    if not lua_dir.exists():
+    if lua_dir_name not in extracted_dirs or "src" not in _subdirectories(lua_dir.parent):
         print(f"[ERROR] Lua source directory does not exist: {lua_dir}")
         print(f"        Expected directory: extracted/{lua_dir_name}/src")
         print("        Make sure you have run the download script first:")
         print("        python download_lua_luarocks.py")
         return False
 
-    if not luarocks_dir.exists():
+    if luarocks_dir_name not in extracted_dirs:
         print(f"[ERROR] LuaRocks directory does not exist: {luarocks_dir}")
         print(f"        Expected directory: extracted/{luarocks_dir_name}")
         print("        Make sure you have run the download script first:")
         print("        python download_lua_luarocks.py")
         return False
 
+    # Build the full copy plan up front: (script name, destination directory)
+    lua_scripts = LUA_BUILD_SCRIPTS[(bool(build_dll), bool(build_debug))]
+    plan = [(name, lua_dir) for name in lua_scripts]
+    plan.append((LUAROCKS_SETUP_SCRIPT, luarocks_dir))
+
+    # Fail fast before copying anything if a source script is missing,
+    # using a single listing of the build scripts directory
+    available = set(os.listdir(BUILD_SCRIPTS_DIR))
+    missing = [name for name, _ in plan if name not in available]
+    if missing:
+        print(f"[ERROR] Missing build scripts in {BUILD_SCRIPTS_DIR}: {', '.join(missing)}")
+        return False
+
     # Copy build scripts
     try:
-        if BUILD_DLL and BUILD_DEBUG:
-            print("Copying DLL debug build scripts...")
-            shutil.copy(os.path.join(build_scripts_dir, "build-dll-debug.bat"), str(lua_dir))
-            shutil.copy(os.path.join(build_scripts_dir, "install_lua_dll.py"), str(lua_dir))
-            print(f"  build-dll-debug.bat -> {lua_dir}")
-            print(f"  install_lua_dll.py -> {lua_dir}")
-        elif BUILD_DLL:
-            print("Copying DLL build scripts...")
-            shutil.copy(os.path.join(build_scripts_dir, "build-dll.bat"), str(lua_dir))
-            shutil.copy(os.path.join(build_scripts_dir, "install_lua_dll.py"), str(lua_dir))
-            print(f"  build-dll.bat -> {lua_dir}")
-            print(f"  install_lua_dll.py -> {lua_dir}")
-        elif BUILD_DEBUG:
-            print("Copying static debug build scripts...")
-            shutil.copy(os.path.join(build_scripts_dir, "build-static-debug.bat"), str(lua_dir))
-            print(f"  build-static-debug.bat -> {lua_dir}")
-        else:
-            print("Copying static build scripts...")
-            shutil.copy(os.path.join(build_scripts_dir, "build-static.bat"), str(lua_dir))
-            print(f"  build-static.bat -> {lua_dir}")
-
-        print("Copying LuaRocks setup script...")
-        shutil.copy(os.path.join(build_scripts_dir, "setup-luarocks.bat"), str(luarocks_dir))
-        print(f"  setup-luarocks.bat -> {luarocks_dir}")
-
-        print("[OK] Build scripts copied successfully.")
+        print(f"Copying {build_type} build scripts...")
+        for name, dest_dir in plan:
+            _staged_copy(BUILD_SCRIPTS_DIR / name, dest_dir)
+            print(f"  {name} -> {dest_dir}")
+
+        print(f"[OK] {len(plan)} build scripts copied successfully.")
         return True
 
     except Exception as e:
         print(f"[ERROR] Failed to copy build scripts: {e}")
         return False
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Command line entry point; returns the process exit code.
+
+    argv defaults to sys.argv[1:], so the flags can be exercised in-process.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    build_dll = BUILD_DLL
+    build_debug = BUILD_DEBUG
+
     # Parse command line arguments
-    if len(sys.argv) > 1:
-        for arg in sys.argv[1:]:
-            if arg == "--dll":
-                BUILD_DLL = 1
-            elif arg == "--debug":
-                BUILD_DEBUG = 1
-            elif arg in ['--help', '-h']:
-                print("Setup Build Scripts")
-                print("Usage:")
-                print("  python setup_build.py                    # Setup for static release build")
-                print("  python setup_build.py --dll              # Setup for DLL release build")
-                print("  python setup_build.py --debug            # Setup for static debug build")
-                print("  python setup_build.py --dll --debug      # Setup for DLL debug build")
-                print("  python setup_build.py --help             # Show this help")
-                print()
-                print("Build Types:")
-                print("  Static Release:  Optimized static library build (default)")
-                print("  DLL Release:     Optimized DLL build")
-                print("  Static Debug:    Unoptimized static build with debug symbols")
-                print("  DLL Debug:       Unoptimized DLL build with debug symbols")
-                print()
-                print("This script copies build scripts to the appropriate directories")
-                print("based on the versions configured in build_config.txt")
-                print()
-                print(f"Current configuration:")
-                print(f"  Lua: {LUA_VERSION}")
-                print(f"  LuaRocks: {LUAROCKS_VERSION} ({LUAROCKS_PLATFORM})")
-                print()
-                print("Expected directories (in extracted folder):")
-                print(f"  extracted/{get_lua_dir_name()}/src")
-                print(f"  extracted/{get_luarocks_dir_name()}")
-                print()
-                print("Make sure to run 'python download_lua_luarocks.py' first!")
-                sys.exit(0)
+    for arg in argv:
+        if arg == "--dll":
+            build_dll = 1
+        elif arg == "--debug":
+            build_debug = 1
+        elif arg in ['--help', '-h']:
+            print("Setup Build Scripts")
+            print("Usage:")
+            print("  python setup_build.py                    # Setup for static release build")
+            print("  python setup_build.py --dll              # Setup for DLL release build")
+            print("  python setup_build.py --debug            # Setup for static debug build")
+            print("  python setup_build.py --dll --debug      # Setup for DLL debug build")
+            print("  python setup_build.py --help             # Show this help")
+            print()
+            print("Build Types:")
+            print("  Static Release:  Optimized static library build (default)")
+            print("  DLL Release:     Optimized DLL build")
+            print("  Static Debug:    Unoptimized static build with debug symbols")
+            print("  DLL Debug:       Unoptimized DLL build with debug symbols")
+            print()
+            print("This script copies build scripts to the appropriate directories")
+            print("based on the versions configured in build_config.txt")
+            print()
+            print(f"Current configuration:")
+            print(f"  Lua: {LUA_VERSION}")
+            print(f"  LuaRocks: {LUAROCKS_VERSION} ({LUAROCKS_PLATFORM})")
+            print()
+            print("Expected directories (in extracted folder):")
+            print(f"  extracted/{get_lua_dir_name()}/src")
+            print(f"  extracted/{get_luarocks_dir_name()}")
+            print()
+            print("Make sure to run 'python download_lua_luarocks.py' first!")
+            return 0
 
     # Run the setup
-    success = copy_build_scripts()
-    if not success:
-        sys.exit(1)
+    return 0 if copy_build_scripts(build_dll, build_debug) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,15 +11,29 @@ Each installation gets a unique UUID and is tracked in the central registry.
 """
 
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 import argparse
+import compileall
+import concurrent.futures
+import re
 
 # Add current directory to Python path for local imports
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
+# Absolute backend directory, resolved once rather than on every call
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECK_ENV_SCRIPT = os.path.join(SCRIPT_DIR, "check-env.bat")
+
+# Interpreter command for --isolate helper runs. The helpers only need the
+# standard library and the backend modules (which they add to sys.path
+# themselves), so skip site-packages processing and user environment hooks;
+# -u keeps their output interleaved with ours (-I ignores PYTHONUNBUFFERED).
+HELPER_PYTHON = [sys.executable, "-I", "-S", "-u"]
+
 # Import configuration system and registry with dual-context support
 try:
     from .config import (
@@ -36,7 +50,6 @@ except ImportError:
     )
     from registry import LuaEnvRegistry
     from utils import info, warning, error, debug, log_with_location
-    from utils import info, warning, error, debug, log_with_location
 
 
 def try_powershell_setenv(architecture="x64"):
@@ -47,8 +60,8 @@ def try_powershell_setenv(architecture="x64"):
     # Find setenv.ps1 script
     script_paths = [
         os.path.join(os.environ.get('USERPROFILE', ''), '.luaenv', 'bin', 'setenv.ps1'),
-        os.path.join(os.path.dirname(__file__), 'setenv.ps1'),
-        os.path.join(os.path.dirname(__file__), '..', 'setenv.ps1'),
+        os.path.join(SCRIPT_DIR, 'setenv.ps1'),
+        os.path.join(SCRIPT_DIR, '..', 'setenv.ps1'),
         'setenv.ps1'
     ]
 
@@ -88,7 +101,7 @@ Get-ChildItem env: | ForEach-Object {{
             debug(f"PowerShell setenv stderr: {result.stderr}")
 
         # Debug: Show first few lines of stdout to see what PowerShell is outputting
-        stdout_lines = result.stdout.strip().split('\n')[:10]
+        stdout_lines = result.stdout.strip().split('\n', 10)[:10]
         debug(f"PowerShell setenv stdout (first 10 lines): {stdout_lines}")
 
         if result.returncode == 0:
@@ -96,8 +109,8 @@ Get-ChildItem env: | ForEach-Object {{
             vs_vars_found = []
             env_vars_set = 0
             for line in result.stdout.strip().split('\n'):
-                if '=' in line:
-                    key, value = line.split('=', 1)
+                key, sep, value = line.partition('=')
+                if sep:
                     if key.upper() not in ['PSModulePath', 'PYTHONPATH', 'PYTHONHOME', 'PROMPT']:
                         os.environ[key] = value
                         env_vars_set += 1
@@ -161,8 +174,8 @@ set
                     # Apply environment variables
                     env_vars_set = 0
                     for line in result.stdout.strip().split('\n'):
-                        if '=' in line and not line.startswith('VCVARS_FAILED'):
-                            key, value = line.split('=', 1)
+                        key, sep, value = line.partition('=')
+                        if sep and not line.startswith('VCVARS_FAILED'):
                             if key.upper() not in ['PSModulePath', 'PYTHONPATH', 'PYTHONHOME', 'PROMPT']:
                                 os.environ[key] = value
                                 env_vars_set += 1
@@ -333,11 +346,28 @@ def setenv(architecture="x64"):
 
     return False
 
+# Human-readable descriptions of the issue codes reported by check-env.bat
+ENV_CHECK_ISSUE_DESCRIPTIONS = {
+    'VCINSTALLDIR_MISSING': 'Visual Studio installation directory not found',
+    'TARGET_ARCH_MISSING': 'Target architecture not set',
+    'WINDOWS_SDK_MISSING': 'Windows SDK directory not found',
+    'WINDOWS_SDK_VERSION_MISSING': 'Windows SDK version not set',
+    'CL_EXE_MISSING': 'C compiler (cl.exe) not found in PATH',
+    'LINK_EXE_MISSING': 'Linker (link.exe) not found in PATH',
+    'LIB_EXE_MISSING': 'Librarian (lib.exe) not found in PATH',
+    'NMAKE_EXE_MISSING': 'NMake (nmake.exe) not found in PATH',
+    'MSVCRT_LIB_MISSING': 'MSVCRT.lib not found',
+    'UCRT_LIB_MISSING': 'UCRT.lib not found',
+    'KERNEL32_LIB_MISSING': 'kernel32.lib not found',
+    'MSVCRT_LOWER_LIB_MISSING': 'msvcrt.lib not found',
+    'LIB_ENV_VAR_MISSING': 'LIB environment variable not set'
+}
+
+
 # Deprecated function TODO exclude in future versions
 def call_check_env_bat_script():
     """Call the check_env.bat script to verify the environment."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    check_env_script = os.path.join(current_dir, "check-env.bat")
+    check_env_script = CHECK_ENV_SCRIPT
 
     if not os.path.exists(check_env_script):
         warning("check-env.bat script not found. Skipping environment check.")
@@ -354,35 +384,19 @@ def call_check_env_bat_script():
         issues = []
 
         for line in result.stdout.strip().split('\n'):
-            if line.startswith('ENV_CHECK_RESULT='):
-                env_ok = line.split('=')[1] == 'SUCCESS'
-            elif line.startswith('ENV_CHECK_ISSUES='):
-                issues_str = line.split('=')[1]
-                issues = [issue for issue in issues_str.split(';') if issue]
+            key, _, value = line.partition('=')
+            if key == 'ENV_CHECK_RESULT':
+                env_ok = value == 'SUCCESS'
+            elif key == 'ENV_CHECK_ISSUES':
+                issues = [issue for issue in value.split(';') if issue]
 
         if env_ok:
             log_with_location("Visual Studio environment is properly configured.", "OK")
             return True
         else:
             error("Visual Studio environment issues detected:")
-            issue_descriptions = {
-                'VCINSTALLDIR_MISSING': 'Visual Studio installation directory not found',
-                'TARGET_ARCH_MISSING': 'Target architecture not set',
-                'WINDOWS_SDK_MISSING': 'Windows SDK directory not found',
-                'WINDOWS_SDK_VERSION_MISSING': 'Windows SDK version not set',
-                'CL_EXE_MISSING': 'C compiler (cl.exe) not found in PATH',
-                'LINK_EXE_MISSING': 'Linker (link.exe) not found in PATH',
-                'LIB_EXE_MISSING': 'Librarian (lib.exe) not found in PATH',
-                'NMAKE_EXE_MISSING': 'NMake (nmake.exe) not found in PATH',
-                'MSVCRT_LIB_MISSING': 'MSVCRT.lib not found',
-                'UCRT_LIB_MISSING': 'UCRT.lib not found',
-                'KERNEL32_LIB_MISSING': 'kernel32.lib not found',
-                'MSVCRT_LOWER_LIB_MISSING': 'msvcrt.lib not found',
-                'LIB_ENV_VAR_MISSING': 'LIB environment variable not set'
-            }
-
             for issue in issues:
-                description = issue_descriptions.get(issue, f"Unknown issue: {issue}")
+                description = ENV_CHECK_ISSUE_DESCRIPTIONS.get(issue, f"Unknown issue: {issue}")
                 print(f"  - {description}")
 
             print("\n[INFO] To fix these issues:")
@@ -399,37 +413,85 @@ def call_check_env_bat_script():
         return True
 
 
-def download_sources():
-    """Download and extract Lua and LuaRocks sources."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    download_script = os.path.join(current_dir, "download_lua_luarocks.py")
+def run_backend_step(step_name, func, *args, **kwargs):
+    """Run a backend script entry point in this interpreter.
+
+    Mirrors subprocess.run(..., check=True): raises RuntimeError if the step
+    returns False or calls sys.exit() with a non-zero code. The working
+    directory is restored afterwards since some steps chdir into build trees.
+    """
+    original_cwd = os.getcwd()
+    try:
+        result = func(*args, **kwargs)
+    except SystemExit as e:
+        if e.code not in (0, None):
+            raise RuntimeError(f"{step_name} failed (exit code {e.code})") from None
+        result = True
+    finally:
+        os.chdir(original_cwd)
+
+    if result is False:
+        raise RuntimeError(f"{step_name} failed")
+
 
+def start_download_sources(isolate=False):
+    """Start downloading Lua and LuaRocks sources in a separate process.
+
+    The download overlaps the environment check, so it runs in its own
+    process rather than a thread: it gets its own working directory and
+    environment, and its output is held back until download_sources().
+    """
+    download_script = os.path.join(SCRIPT_DIR, "download_lua_luarocks.py")
+    python = HELPER_PYTHON if isolate else [sys.executable]
+    return subprocess.Popen([*python, download_script], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, env=os.environ.copy())
+
+
+def download_sources(download_process):
+    """Wait for the download started by start_download_sources() and show its output."""
     print("[PROGRESS] Starting download process...")
     info("Downloading sources...")
-    subprocess.run([sys.executable, download_script], check=True, env=os.environ.copy())
+    output, _ = download_process.communicate()
+    if output:
+        print(output, end="")
+    if download_process.returncode != 0:
+        raise subprocess.CalledProcessError(download_process.returncode, download_process.args)
     print("[PROGRESS] Download completed successfully")
 
 
-def setup_build_scripts(with_dll=False, with_debug=False):
+def stop_download_sources(download_process):
+    """Terminate a download started by start_download_sources() and reap it."""
+    if download_process.poll() is None:
+        download_process.terminate()
+    download_process.communicate()
+
+
+def setup_build_scripts(with_dll=False, with_debug=False, isolate=False):
     """Copy build scripts to extracted directories."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    setup_build_script = os.path.join(current_dir, "setup_build.py")
+    setup_build_script = os.path.join(SCRIPT_DIR, "setup_build.py")
 
     print("[PROGRESS] Copying build scripts...")
     info("Setting up build scripts...")
-    setup_build_args = [sys.executable, setup_build_script]
-    if with_dll:
-        setup_build_args.append("--dll")
-    if with_debug:
-        setup_build_args.append("--debug")
-    subprocess.run(setup_build_args, check=True, env=os.environ.copy())
+    if isolate:
+        setup_build_args = [*HELPER_PYTHON, setup_build_script]
+        if with_dll:
+            setup_build_args.append("--dll")
+        if with_debug:
+            setup_build_args.append("--debug")
+        subprocess.run(setup_build_args, check=True, env=os.environ.copy())
+    else:
+        try:
+            from . import setup_build
+        except ImportError:
+            import setup_build
+        run_backend_step("Build scripts setup", setup_build.copy_build_scripts,
+                         build_dll=with_dll, build_debug=with_debug)
     print("[PROGRESS] Build scripts setup completed")
 
 
-def build_lua(installation_path, with_dll=False, with_debug=False):
+def build_lua(installation_path, with_dll=False, with_debug=False, isolate=False):
     """Build and install Lua to the specified path."""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    build_script = os.path.join(current_dir, "build.py")
+    build_script = os.path.join(SCRIPT_DIR, "build.py")
 
     print("[PROGRESS] Starting compilation process...")
     info(f"Building and installing to {installation_path}...")
@@ -447,17 +509,71 @@ def build_lua(installation_path, with_dll=False, with_debug=False):
             print(f"  {var}: {value}")
     print()
 
-    build_args = [sys.executable, build_script, "--prefix", str(installation_path)]
-    if with_dll:
-        build_args.append("--dll")
-    if with_debug:
-        build_args.append("--debug")
-    subprocess.run(build_args, check=True, env=os.environ.copy())
+    if isolate:
+        build_args = [*HELPER_PYTHON, build_script, "--prefix", str(installation_path)]
+        if with_dll:
+            build_args.append("--dll")
+        if with_debug:
+            build_args.append("--debug")
+        subprocess.run(build_args, check=True, env=os.environ.copy())
+    else:
+        try:
+            from . import build
+        except ImportError:
+            import build
+        run_backend_step("Lua build", build.run_build_scripts,
+                         build_dll=with_dll, build_debug=with_debug,
+                         install_dir=str(installation_path))
     print("[PROGRESS] Lua build completed successfully")
 
 
-def test_lua_build(installation_path, lua_version, run_tests=True):
-    """Test the Lua build by running basic commands and test suite."""
+def find_lua_test_files(tests_dir):
+    """List the test files that all.lua runs, in the order it runs them."""
+    try:
+        content = (Path(tests_dir) / "all.lua").read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return []
+
+    test_files = []
+    for name in re.findall(r"""(?:dofile|loadfile)\s*\(?\s*["']([\w-]+\.lua)["']""", content):
+        if name not in test_files and (Path(tests_dir) / name).exists():
+            test_files.append(name)
+    return test_files
+
+
+# Globals all.lua derives from _U before it loads the test files; each file
+# run on its own needs them set directly to skip the same sections
+LUA_TEST_GLOBALS = "_U=true _soft=true _port=true _nomsg=true"
+
+
+def run_lua_tests_parallel(lua_exe, tests_dir, test_files, timeout=300):
+    """Run Lua test files concurrently, one lua.exe per file.
+
+    Returns the list of test files that failed.
+    """
+    def run_test_file(test_file):
+        result = subprocess.run([lua_exe, "-e", LUA_TEST_GLOBALS, test_file], cwd=tests_dir,
+                                capture_output=True, text=True, timeout=timeout)
+        return test_file, result.returncode
+
+    failed_files = []
+    max_workers = min(os.cpu_count() or 1, len(test_files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for test_file, returncode in executor.map(run_test_file, test_files):
+            status = "OK" if returncode == 0 else f"FAILED (exit code {returncode})"
+            print(f"  {test_file}: {status}")
+            if returncode != 0:
+                failed_files.append(test_file)
+
+    return failed_files
+
+
+def test_lua_build(installation_path, lua_version, run_tests=True, parallel_tests=False):
+    """Test the Lua build by running basic commands and test suite.
+
+    all.lua is run as a whole unless parallel_tests is set, in which case
+    the test files it lists are run in parallel.
+    """
     lua_exe = Path(installation_path) / "bin" / "lua.exe"
 
     if not lua_exe.exists():
@@ -482,46 +598,63 @@ def test_lua_build(installation_path, lua_version, run_tests=True):
         # Test 3: Run test suite if requested
         if run_tests:
             print("[PROGRESS] Running comprehensive test suite...")
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            tests_dir = Path(current_dir) / "extracted" / get_lua_tests_dir_name()
+            tests_dir = Path(SCRIPT_DIR) / "extracted" / get_lua_tests_dir_name()
             if tests_dir.exists():
                 log_with_location(f"Running Lua {lua_version} basic test suite...", "INFO")
                 info("Running basic tests (_U=true flag) - some warnings are normal.")
 
-                original_cwd = os.getcwd()
                 abs_lua_exe = os.path.abspath(lua_exe)
+                test_files = find_lua_test_files(tests_dir) if parallel_tests else []
 
-                try:
-                    os.chdir(tests_dir)
-                    info("Running: lua.exe -e \"_U=true\" all.lua (Basic Test Suite)")
-                    result = subprocess.run([abs_lua_exe, "-e", "_U=true", "all.lua"],
-                                          capture_output=True, text=True, timeout=300)
+                if test_files:
+                    info(f"Running {len(test_files)} test files from all.lua in parallel")
+                    try:
+                        failed_files = run_lua_tests_parallel(abs_lua_exe, tests_dir, test_files)
+                    finally:
+                        print("[PROGRESS] Test suite completed")
 
-                    if result.returncode == 0:
+                    if not failed_files:
                         log_with_location("Basic test suite completed successfully!", "OK")
-                        lines = result.stdout.split('\n')
-                        for line in lines[-10:]:
-                            if line.strip():
-                                print(f"  {line}")
                     else:
-                        info("Basic test suite completed with issues:")
-                        # print("  STDOUT:")
-                        # for line in result.stdout.split('\n')[-20:]:
-                        #     if line.strip():
-                        #         print(f"    {line}")
-                        # print("  STDERR:")
-                        # for line in result.stderr.split('\n')[-10:]:
-                        #     if line.strip():
-                        #         print(f"    {line}")
-
+                        info(f"Basic test suite completed with issues in: {', '.join(failed_files)}")
                         print(f"\n[TIP] Some test failures are common on Windows for Lua {lua_version}.")
                         print("  These are common for x86 builds and builds with --debug flag.")
                         print("  Your Lua build is likely fine for normal use.")
                         return False
-
-                finally:
-                    os.chdir(original_cwd)
-                    print("[PROGRESS] Test suite completed")
+                else:
+                    original_cwd = os.getcwd()
+
+                    try:
+                        os.chdir(tests_dir)
+                        info("Running: lua.exe -e \"_U=true\" all.lua (Basic Test Suite)")
+                        result = subprocess.run([abs_lua_exe, "-e", "_U=true", "all.lua"],
+                                              capture_output=True, text=True, timeout=300)
+
+                        if result.returncode == 0:
+                            log_with_location("Basic test suite completed successfully!", "OK")
+                            # Only the tail is shown, so bound the split
+                            for line in result.stdout.rsplit('\n', 10)[-10:]:
+                                if line.strip():
+                                    print(f"  {line}")
+                        else:
+                            info("Basic test suite completed with issues:")
+                            # print("  STDOUT:")
+                            # for line in result.stdout.rsplit('\n', 20)[-20:]:
+                            #     if line.strip():
+                            #         print(f"    {line}")
+                            # print("  STDERR:")
+                            # for line in result.stderr.rsplit('\n', 10)[-10:]:
+                            #     if line.strip():
+                            #         print(f"    {line}")
+
+                            print(f"\n[TIP] Some test failures are common on Windows for Lua {lua_version}.")
+                            print("  These are common for x86 builds and builds with --debug flag.")
+                            print("  Your Lua build is likely fine for normal use.")
+                            return False
+
+                    finally:
+                        os.chdir(original_cwd)
+                        print("[PROGRESS] Test suite completed")
             else:
                 warning(f"Tests directory {tests_dir} not found.")
                 return False
@@ -545,55 +678,93 @@ def test_lua_build(installation_path, lua_version, run_tests=True):
 
 
 def create_installation(lua_version, luarocks_version, build_type, build_config,
-                       name=None, alias=None, architecture="x64", skip_env_check=False, skip_tests=False):
-    """Create a new Lua installation in the LuaEnv system."""
+                       name=None, alias=None, architecture="x64", skip_env_check=False, skip_tests=False,
+                       isolate=False, parallel_tests=False):
+    """Create a new Lua installation in the LuaEnv system.
+
+    By default the build-script and build steps run in-process; isolate=True
+    runs each of them in a separate Python subprocess instead. The download
+    always gets its own process, since it overlaps the environment check.
+    """
 
     # Initialize registry
     registry = LuaEnvRegistry()
 
-    # Check environment unless explicitly skipped
-    if not skip_env_check:
-        print("[PROGRESS] Setting up Visual Studio environment...")
-        env_set = setenv(architecture)
-        if not env_set:
-            error("Environment setup failed. Build cannot proceed.")
-            print("[INFO] To fix this issue:")
-            print("1. Install Visual Studio with C++ development tools")
-            print("2. OR run the environment setup manually:")
-            arch_param = "x86" if architecture == "x86" else "amd64"
-            print(f"   luaenv.ps1 -SetupVS -Arch {arch_param}")
-            print("3. Then retry the installation with --skip-env-check flag:")
-            print(f"   luaenv install --skip-env-check {('--x86' if architecture == 'x86' else '')}")
-            error("Installation cancelled due to environment setup failure.")
-            return None
-
-    # Create installation record in registry
-    info(f"Creating new installation: Lua {lua_version}, LuaRocks {luarocks_version}")
-    info(f"Build: {build_type} {build_config}")
-
-    installation_id = registry.create_installation(
-        lua_version=lua_version,
-        luarocks_version=luarocks_version,
-        build_type=build_type,
-        build_config=build_config,
-        architecture=architecture,
-        name=name,
-        alias=alias
-    )
+    if isolate:
+        # Compile the backend modules once up front so each helper process
+        # finds ready bytecode instead of compiling the shared imports itself
+        compileall.compile_dir(SCRIPT_DIR, maxlevels=0, quiet=1)
+
+    # Reject a duplicate alias before the download starts; the registry
+    # checks it again when the installation record is created
+    if alias and alias in registry.registry["aliases"]:
+        error(f"Alias '{alias}' already exists")
+        return None
+
+    # Downloading is network-bound and does not depend on the Visual Studio
+    # environment, so start it now and overlap it with the environment check.
+    # Until Step 1 takes it over, any early exit must not leave it running.
+    download_process = start_download_sources(isolate=isolate)
+    download_handed_off = False
+    try:
+        # Check environment unless explicitly skipped
+        if not skip_env_check:
+            print("[PROGRESS] Setting up Visual Studio environment...")
+            env_set = setenv(architecture)
+            if not env_set:
+                error("Environment setup failed. Build cannot proceed.")
+                print("[INFO] To fix this issue:")
+                print("1. Install Visual Studio with C++ development tools")
+                print("2. OR run the environment setup manually:")
+                arch_param = "x86" if architecture == "x86" else "amd64"
+                print(f"   luaenv.ps1 -SetupVS -Arch {arch_param}")
+                print("3. Then retry the installation with --skip-env-check flag:")
+                print(f"   luaenv install --skip-env-check {('--x86' if architecture == 'x86' else '')}")
+                error("Installation cancelled due to environment setup failure.")
+                # Let the background download finish; completed files are
+                # registered and reused on retry
+                info("Waiting for the background download to finish...")
+                output, _ = download_process.communicate()
+                if download_process.returncode == 0:
+                    info("Sources downloaded; they will be reused on retry.")
+                else:
+                    if output:
+                        print(output, end="")
+                    warning(f"Background download failed (exit code {download_process.returncode})")
+                return None
+
+        # Create installation record in registry
+        info(f"Creating new installation: Lua {lua_version}, LuaRocks {luarocks_version}")
+        info(f"Build: {build_type} {build_config}")
+
+        installation_id = registry.create_installation(
+            lua_version=lua_version,
+            luarocks_version=luarocks_version,
+            build_type=build_type,
+            build_config=build_config,
+            architecture=architecture,
+            name=name,
+            alias=alias
+        )
 
-    installation = registry.get_installation(installation_id)
-    installation_path = Path(installation["installation_path"])
+        installation = registry.get_installation(installation_id)
+        installation_path = Path(installation["installation_path"])
+        download_handed_off = True
+    finally:
+        if not download_handed_off:
+            stop_download_sources(download_process)
 
     try:
-        # Step 1: Download sources
+        # Step 1: Download sources (started above, wait for it to finish)
         print("[PROGRESS] Downloading Lua sources...")
-        download_sources()
+        download_sources(download_process)
 
         # Step 2: Setup build scripts
         print("[PROGRESS] Setting up build scripts...")
         setup_build_scripts(
             with_dll=(build_type == "dll"),
-            with_debug=(build_config == "debug")
+            with_debug=(build_config == "debug"),
+            isolate=isolate
         )
 
         # Step 3: Build and install
@@ -601,7 +772,8 @@ def create_installation(lua_version, luarocks_version, build_type, build_config,
         build_lua(
             installation_path,
             with_dll=(build_type == "dll"),
-            with_debug=(build_config == "debug")
+            with_debug=(build_config == "debug"),
+            isolate=isolate
         )
 
         # Step 4: Test installation
@@ -610,7 +782,8 @@ def create_installation(lua_version, luarocks_version, build_type, build_config,
             print("\n" + "="*60)
             print("TESTING INSTALLATION")
             print("="*60)
-            test_success = test_lua_build(installation_path, lua_version, run_tests=True)
+            test_success = test_lua_build(installation_path, lua_version, run_tests=True,
+                                          parallel_tests=parallel_tests)
             if not test_success:
                 print("Some tests did not pass, but installation may still be usable.")
             else:
@@ -688,11 +861,10 @@ def list_installations():
 
 def backup_config():
     """Backup the current config file."""
-    config_file = Path(__file__).parent / "build_config.txt"
-    backup_file = Path(__file__).parent / "build_config.txt.backup"
+    config_file = Path(SCRIPT_DIR) / "build_config.txt"
+    backup_file = Path(SCRIPT_DIR) / "build_config.txt.backup"
 
     if config_file.exists():
-        import shutil
         shutil.copy2(str(config_file), str(backup_file))
         return True
     return False
@@ -700,11 +872,10 @@ def backup_config():
 
 def restore_config():
     """Restore the backed up config file."""
-    config_file = Path(__file__).parent / "build_config.txt"
-    backup_file = Path(__file__).parent / "build_config.txt.backup"
+    config_file = Path(SCRIPT_DIR) / "build_config.txt"
+    backup_file = Path(SCRIPT_DIR) / "build_config.txt.backup"
 
     if backup_file.exists():
-        import shutil
         shutil.copy2(str(backup_file), str(config_file))
         backup_file.unlink()  # Remove backup file
         return True
@@ -713,7 +884,7 @@ def restore_config():
 
 def create_temp_config(lua_version=None, luarocks_version=None, architecture=None):
     """Create a temporary config with specified versions and architecture."""
-    config_file = Path(__file__).parent / "build_config.txt"
+    config_file = Path(SCRIPT_DIR) / "build_config.txt"
 
     # Read current config or use defaults
     current_config = {}
@@ -722,9 +893,10 @@ def create_temp_config(lua_version=None, luarocks_version=None, architecture=Non
             with open(config_file, 'r', encoding='utf-8') as f:
                 for line in f:
                     line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        current_config[key.strip()] = value.strip()
+                    if line and not line.startswith('#'):
+                        key, sep, value = line.partition('=')
+                        if sep:
+                            current_config[key.strip()] = value.strip()
         except Exception as e:
             print(f"[WARNING] Failed to read current config: {e}")
 
@@ -763,24 +935,25 @@ def create_temp_config(lua_version=None, luarocks_version=None, architecture=Non
         else:
             print(f"[WARNING] Unknown architecture '{architecture}', keeping default LUAROCKS_PLATFORM")
 
-    # Write temporary config
+    # Write temporary config in a single write
+    payload = (
+        "# Temporary configuration file for per-installation versions\n"
+        "# This file was automatically generated - do not edit manually\n"
+        "\n"
+        + "".join(f"{key}={value}\n" for key, value in current_config.items())
+    )
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            f.write("# Temporary configuration file for per-installation versions\n")
-            f.write("# This file was automatically generated - do not edit manually\n")
-            f.write("\n")
-            for key, value in current_config.items():
-                f.write(f"{key}={value}\n")
+        config_file.write_text(payload, encoding='utf-8')
         return True
     except Exception as e:
         print(f"[ERROR] Failed to create temporary config: {e}")
         return False
 
 
-def remove_installation(id_or_alias):
+def remove_installation(id_or_alias, assume_yes=False):
     """Remove an installation from the registry and filesystem."""
     registry = LuaEnvRegistry()
-    return registry.remove_installation(id_or_alias, confirm=True)
+    return registry.remove_installation(id_or_alias, confirm=not assume_yes)
 
 
 def main():
@@ -802,6 +975,7 @@ Examples:
   python setup_lua.py --list                             # List all installations
   python setup_lua.py --remove dev                       # Remove installation by alias
   python setup_lua.py --remove a1b2c3d4                  # Remove by partial UUID
+  python setup_lua.py --remove dev --yes                 # Remove without confirmation (CI/scripts)
 
 Manual Environment Setup (if automatic setup fails):
   %USERPROFILE%\\.luaenv\\bin\\setenv.ps1 -Arch amd64 -Current  # Setup x64 environment manually
@@ -862,6 +1036,12 @@ Each installation gets a unique UUID for identification.
                        help="Skip Visual Studio environment check")
     parser.add_argument("--skip-tests", action="store_true",
                        help="Skip test suite after building")
+    parser.add_argument("--parallel-tests", action="store_true",
+                       help="Run the Lua test files in parallel instead of serially through all.lua")
+    parser.add_argument("--yes", "-y", action="store_true",
+                       help="Assume 'yes' for all confirmation prompts (for scripted/CI runs)")
+    parser.add_argument("--isolate", action="store_true",
+                       help="Run download/build steps in separate Python processes (for debugging)")
 
     args = parser.parse_args()
 
@@ -878,7 +1058,7 @@ Each installation gets a unique UUID for identification.
 
     # Handle remove command
     if args.remove:
-        success = remove_installation(args.remove)
+        success = remove_installation(args.remove, assume_yes=args.yes)
         sys.exit(0 if success else 1)
 
     # Handle create installation (default action)
@@ -973,7 +1153,9 @@ Each installation gets a unique UUID for identification.
             name=args.name,
             alias=args.alias,
             skip_env_check=args.skip_env_check,
-            skip_tests=args.skip_tests
+            skip_tests=args.skip_tests,
+            isolate=args.isolate,
+            parallel_tests=args.parallel_tests
         )
 
         if installation_id:
@@ -13,9 +13,12 @@ import shutil
 import tarfile
 import subprocess
 import os
+import sys
 import zipfile
 import json
 import inspect
+import tempfile
+import time
 from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 
@@ -108,6 +111,39 @@ def log(message, level: str = "INFO", location: str = ".") -> None:
     prefix = levels.get(level, "[INFO]")
     print(f"{location}: {prefix} {message}")
 
+# Values of CI / NONINTERACTIVE that mean "running unattended"
+_TRUTHY_ENV_VALUES = ('1', 'true', 'yes', 'on')
+
+def _env_flag(name: str) -> bool:
+    """Return True if the environment variable is set to a truthy value."""
+    return os.environ.get(name, '').strip().lower() in _TRUTHY_ENV_VALUES
+
+def ask_yes_no(prompt: str) -> bool:
+    """
+    Ask a y/N confirmation question, defaulting to 'no' when non-interactive.
+
+    When CI or NONINTERACTIVE is set to a truthy value (1/true/yes/on), or
+    stdin is closed, the prompt is not shown (or its EOFError is swallowed)
+    and the answer is 'no', so scripted runs exit early instead of blocking
+    or crashing. Callers that can run
+    unattended should offer their own way to skip the prompt.
+
+    Args:
+        prompt: Question to show, including the [y/N] hint
+
+    Returns:
+        bool: True if the user answered yes
+    """
+    if _env_flag('CI') or _env_flag('NONINTERACTIVE'):
+        print(f"{prompt}n (non-interactive; answering no)")
+        return False
+    try:
+        response = input(prompt)
+    except EOFError:
+        print("\n[INFO] No input available; answering no")
+        return False
+    return response.strip().lower() in ('y', 'yes')
+
 def get_backend_dir() -> Path:
     """Get the backend directory path."""
     # Assuming the backend directory is in the same location as this script
@@ -199,6 +235,117 @@ def _safe_move(source, dest):
     shutil.move(str(source), str(dest))
     print(f"Moved {source} to {dest}")
 
+def fast_copy(src, dst):
+    """
+    Copy a file using the native OS copy routine where available.
+
+    On Windows this calls kernel32.CopyFile2, which avoids shutil's userspace
+    read/write loop. Elsewhere, or if the native call fails, it falls back to
+    shutil.copyfile. Like shutil.copy, dst may be a directory, in which case
+    the file keeps its name.
+
+    Args:
+        src: Path to the source file
+        dst: Destination file or directory
+
+    Returns:
+        Path: Path to the copied file
+    """
+    src = Path(src)
+    dst = Path(dst)
+    if dst.is_dir():
+        dst = dst / src.name
+
+    if os.name == 'nt':
+        try:
+            import ctypes
+            # CopyFile2 returns an HRESULT; S_OK (0) means the copy succeeded
+            if ctypes.windll.kernel32.CopyFile2(str(src), str(dst), None) == 0:
+                return dst
+        except (AttributeError, OSError):
+            pass
+
+    shutil.copyfile(src, dst)
+    return dst
+
+# Attempts and delay (seconds) for os.replace while another process holds
+# the target open, which Windows reports as PermissionError
+REPLACE_RETRIES = 10
+REPLACE_RETRY_DELAY = 0.05
+
+def atomic_write_text(path, text, encoding='utf-8'):
+    """
+    Write text to a file atomically.
+
+    The text is written to a uniquely named temporary file in the same
+    directory, which is then moved over the target with os.replace. An
+    interrupted write leaves the previous file intact instead of a truncated
+    one, and concurrent writers never share a temporary file. The replace is
+    retried briefly while another process has the target open.
+
+    Args:
+        path: Destination file
+        text: Full file contents
+        encoding: Text encoding (default: utf-8)
+
+    Returns:
+        Path: Path to the written file
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + '.', suffix='.tmp')
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+        # mkstemp creates the file owner-only; keep the target's permissions
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(tmp_path, path)
+                break
+            except PermissionError:
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(REPLACE_RETRY_DELAY)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+def _clear_readonly(func, path, exc):
+    """rmtree error handler that clears the read-only bit and retries."""
+    os.chmod(path, 0o777)
+    func(path)
+
+def fast_rmtree(path):
+    """
+    Remove a directory tree, preferring the native OS delete where available.
+
+    On Windows this delegates to 'rd /s /q', which is considerably faster than
+    shutil's per-file unlink loop for large LuaRocks trees. If that is not
+    available or leaves anything behind, shutil.rmtree finishes the job,
+    clearing read-only attributes (common on installed binaries) as it goes.
+
+    Args:
+        path: Directory to remove
+    """
+    path = Path(path)
+
+    if os.name == 'nt':
+        subprocess.run(['cmd', '/c', 'rd', '/s', '/q', str(path)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=False)
+        if not path.exists():
+            return
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_clear_readonly)
+    else:
+        shutil.rmtree(path, onerror=_clear_readonly)
+
 def create_directory_structure(base_path, structure):
     """
     Create a directory structure from a dictionary.
@@ -240,6 +387,26 @@ def verify_file_exists(file_path):
     path = Path(file_path)
     return path.exists() and path.is_file() and path.stat().st_size > 0
 
+def list_nonempty_files(directory):
+    """
+    List the non-empty regular files in a directory with one os.scandir.
+
+    Checking several files of the same directory against the returned set
+    costs one listing instead of a verify_file_exists() stat per file.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        set: File names (empty if the directory is missing or unreadable)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries
+                    if entry.is_file() and entry.stat().st_size > 0}
+    except OSError:
+        return set()
+
 def update_build_config(lua_version, luarocks_version, luarocks_platform, config_file="build_config.txt"):
     """
     Update the build_config.txt file with new version settings.
@@ -385,8 +552,7 @@ def clean_extracted_folder(base_path=".", confirm=True):
         for item in items:
             print(f"  - {item.name}")
 
-        response = input("Remove all items? (y/N): ").strip().lower()
-        if response not in ['y', 'yes']:
+        if not ask_yes_no("Remove all items? (y/N): "):
             print("Cancelled")
             return False
 
@@ -4,10 +4,24 @@
 import subprocess
 import time
 import os
+import re
+import json
+import atexit
+import uuid
+import io
+import sys
 
 # Define the path to the luaenv PowerShell script
 USER_PROFILE = os.environ.get('USERPROFILE')
 LUAENV_SCRIPT = os.path.join(USER_PROFILE, '.luaenv', 'bin', 'luaenv.ps1')
+LUAENV_REGISTRY = os.path.join(USER_PROFILE, '.luaenv', 'registry.json')
+
+# Lines the backend prints once an install or uninstall has fully finished
+INSTALL_DONE_MARKER = "Installation completed successfully!"
+UNINSTALL_DONE_MARKER = "[OK] Removed installation:"
+
+# Matches the "(alias: name)" suffix of each 'luaenv list' entry
+_ALIAS_RE = re.compile(r"\(alias:\s*([A-Za-z0-9_]+)\)")
 
 # Global test cases configuration
 TEST_CASES = [
@@ -56,71 +70,276 @@ TEST_CASES = [
 ]
 
 def execute_command(command, **kwargs):
-    try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True, **kwargs)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        return f"Error: {e.stderr.strip()}"
+    result = subprocess.run(command, capture_output=True, text=True, **kwargs)
+    if result.returncode != 0:
+        return f"Error: {result.stderr.strip()}"
+    return result.stdout.strip()
+
+# One long-lived PowerShell host, so commands skip PowerShell startup; a
+# host that exits is replaced, and every host started is closed at exit
+_ps_current = {"host": None}
+_ps_hosts = []
+
+def _get_ps():
+    """
+    Return the PowerShell host, starting it if needed.
+    """
+    ps = _ps_current["host"]
+    if ps is None or ps.poll() is not None:
+        ps = subprocess.Popen(
+            ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1)
+        _ps_current["host"] = ps
+        _ps_hosts.append(ps)
+
+        # Warm the host: the first run parses luaenv.ps1 and loads its
+        # modules, and PowerShell keeps the compiled script for later calls
+        ps.stdin.write(f'& "{LUAENV_SCRIPT}" help > $null; Write-Output "===READY==="\n')
+        ps.stdin.flush()
+        for line in ps.stdout:
+            if line.startswith("===READY==="):
+                break
+    return ps
+
+def _close_ps_hosts():
+    """
+    Shut down every PowerShell host started by this module.
+    """
+    for ps in _ps_hosts:
+        if ps.poll() is None:
+            try:
+                ps.stdin.close()
+                ps.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                ps.kill()
+
+atexit.register(_close_ps_hosts)
+
+def build_ps_command(command):
+    """
+    Return the PowerShell command line that runs luaenv.ps1 with the given arguments.
+    """
+    return f'& "{LUAENV_SCRIPT}" {command}'
 
 def execute_luaenv_command(command, **kwargs):
     """
     Execute a luaenv command with the given arguments and return the output.
-    Execute the luaenv.ps1 script through PowerShell
+    Execute the luaenv.ps1 script through the persistent PowerShell host; extra subprocess arguments fall back to a one-off PowerShell process.
     """
-    # Create PowerShell command to run luaenv.ps1 with the given arguments
-    ps_command = f'& "{LUAENV_SCRIPT}" {command}'
-    full_command = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_command]
-    return execute_command(full_command, **kwargs)
+    return execute_prebuilt(build_ps_command(command), **kwargs)
+
+def execute_prebuilt(ps_command, **kwargs):
+    """
+    Execute a PowerShell command line built by build_ps_command.
+    """
+    if kwargs:
+        full_command = ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_command]
+        return execute_command(full_command, **kwargs)
+
+    # Stream the command to the host and read until its completion marker
+    token = uuid.uuid4().hex
+    ps = _get_ps()
+    ps.stdin.write(f'$global:LASTEXITCODE = 0; {ps_command}; Write-Output "===END=== {token} $LASTEXITCODE"\n')
+    ps.stdin.flush()
+
+    lines = []
+    exit_code = None
+    for line in ps.stdout:
+        if line.startswith(f"===END=== {token}"):
+            exit_code = line.split()[-1]
+            break
+        lines.append(line)
+
+    output = "".join(lines).strip()
+    if exit_code is None:
+        # The host exited mid-command; the next call starts a fresh one
+        return f"Error: PowerShell host exited unexpectedly: {output}"
+    if exit_code != "0":
+        return f"Error: {output}"
+    return output
+
+# The test case commands never change, so build their command lines once
+for _test_case in TEST_CASES:
+    _test_case["_install_ps"] = build_ps_command(_test_case["install_command"])
+    _test_case["_uninstall_ps"] = build_ps_command(_test_case["uninstall_command"])
+
+def wait_until(predicate, timeout, interval=0.5):
+    """
+    Poll predicate until it returns True or timeout seconds have passed.
+    Returns the final result of predicate, so fast cases return immediately.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+def case_timeout(test_case):
+    """
+    Return how long to wait for a test case's command to take effect.
+    The DLL build is known to be the slowest to install and uninstall.
+    """
+    return 20 if test_case['alias'] == 'test_dll' else 10
+
+def run_cases(cases, phase):
+    """
+    Run the install or uninstall command of each test case, one at a time.
+    Installs share the backend's download folders and build_config.txt, and
+    uninstalls rewrite the registry file, so cases must not overlap.
+    Returns (test_case, output, duration_seconds) tuples in case order.
+    """
+    case_runs = []
+    for index, test_case in enumerate(cases):
+        label = test_case['name'] if phase == "install" else f"Uninstall {test_case['name']}"
+        command = test_case[f"{phase}_command"]
+        print(f"Test {index+1}/{len(cases)}: {label}")
+        print(f"  Command: luaenv {command}")
+
+        start_time = time.time()
+        output = execute_prebuilt(test_case[f"_{phase}_ps"])
+        duration = round(time.time() - start_time, 1)
+
+        print(f"  Command output: {output}")
+        case_runs.append((test_case, output, duration))
+
+    # The installations changed, so any cached list output is stale
+    invalidate_list_cache()
+    return case_runs
+
+# Last 'luaenv list' and 'luaenv list --detailed' outputs, keyed by the
+# detailed flag, reused by verifiers within a short window
+_list_cache = {
+    False: {"time": 0.0, "output": ""},
+    True: {"time": 0.0, "output": ""},
+}
+
+def cached_list(ttl=0.5, detailed=False):
+    """
+    Return the output of 'luaenv list' (or 'list --detailed'), reusing the
+    previous output if it is less than ttl seconds old. The detailed output
+    lists every alias too, so a fresh one also answers basic queries.
+    Each call otherwise costs a PowerShell spawn.
+    """
+    now = time.monotonic()
+    entry = _list_cache[detailed]
+    if now - entry["time"] < ttl:
+        return entry["output"]
+    if not detailed and now - _list_cache[True]["time"] < ttl:
+        return _list_cache[True]["output"]
+
+    entry["output"] = execute_luaenv_command("list --detailed" if detailed else "list")
+    entry["time"] = now
+    return entry["output"]
+
+def invalidate_list_cache():
+    """
+    Force the next cached_list() call to run 'luaenv list' again.
+    """
+    for entry in _list_cache.values():
+        entry["time"] = 0.0
+
+def parse_installed(output):
+    """
+    Return the set of aliases in 'luaenv list' output.
+    Matching the whole "(alias: name)" pattern prevents substring false
+    positives such as "test_dll" in "test_dll_debug".
+    """
+    return set(_ALIAS_RE.findall(output))
+
+def registry_aliases():
+    """
+    Return the set of aliases in the luaenv registry file, or None if it
+    cannot be read. 'luaenv list' has no JSON output, but it reports this
+    registry, so reading it gives exact aliases without a PowerShell spawn.
+    """
+    try:
+        with open(LUAENV_REGISTRY, 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+        return set(registry["aliases"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def list_aliases():
+    """
+    Return the set of installed aliases, from the registry file when it is
+    readable and from 'luaenv list' output otherwise.
+    """
+    aliases = registry_aliases()
+    if aliases is not None:
+        return aliases
+    return parse_installed(cached_list())
+
+def wait_for_alias(alias, present, timeout):
+    """
+    Poll 'luaenv list' until alias is listed (present=True) or gone.
+    Returns (success, output of the last list call), so callers can show
+    the list without running it again.
+    """
+    last = {"output": ""}
+
+    def check():
+        last["output"] = cached_list()
+        return (alias in parse_installed(last["output"])) == present
+
+    invalidate_list_cache()
+    success = wait_until(check, timeout)
+    return success, last["output"]
 
 def verify_installation(alias):
     """
     Verify that an installation with the given alias exists.
     Returns True if the installation exists, False otherwise.
     """
-    output = execute_luaenv_command("list")
-    print(f"  Verification output: {output}")
-    print(f"  Looking for alias: {alias}")
-    exists = alias in output
-    print(f"  Found in output: {exists}")
-    return exists
+    return alias in list_aliases()
 
 def test_install():
     """
     Test the luaenv install command with different combinations of arguments.
+    Returns the results and the 'luaenv list --detailed' output they were
+    verified against.
     """
     print("\n=== TESTING INSTALL COMMAND ===\n")
 
     results = []
 
-    # Run each test case
-    for i, test_case in enumerate(TEST_CASES):
-        print(f"Test {i+1}/{len(TEST_CASES)}: {test_case['name']}")
-        print(f"  Command: luaenv {test_case['install_command']}")
+    # Run the test cases, then check every alias with one 'list' per poll
+    case_runs = run_cases(TEST_CASES, "install")
 
-        start_time = time.time()
-        output = execute_luaenv_command(test_case['install_command'])
-        end_time = time.time()
+    # Cases whose output reports completion need no waiting; poll the rest
+    pending = [test_case for test_case, output, _ in case_runs
+               if INSTALL_DONE_MARKER not in output]
+    expected = {test_case['alias'] for test_case in pending}
 
-        print(f"  Command output: {output}")
+    def all_installed():
+        return expected <= list_aliases()
+
+    if pending:
+        print("\nWaiting for installations to complete...")
+        wait_until(all_installed, timeout=max(map(case_timeout, pending)))
+
+    # One detailed list serves both the per-case checks and the final report
+    detailed_output = cached_list(ttl=0, detailed=True)
+    installed = parse_installed(detailed_output)
 
-        # Check if installation was successful
-        print(f"  Waiting 3 seconds for installation to complete...")
-        time.sleep(3)  # Give more time for async processes to complete
-        success = verify_installation(test_case['alias'])
+    log = io.StringIO()
+    for test_case, output, duration in case_runs:
+        success = test_case['alias'] in installed
 
         # Record result
         result = {
             "test_name": test_case["name"],
             "command": test_case["install_command"],
             "success": success,
-            "duration_seconds": round(end_time - start_time, 1)
+            "duration_seconds": duration
         }
         results.append(result)
 
         # Print result
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"  Result: {status} (took {result['duration_seconds']} seconds)")
-        print()
+        print(f"  {test_case['name']}: {status} (took {result['duration_seconds']} seconds)", file=log)
+    print(log.getvalue())
 
     # Print summary
     print("\n=== INSTALL TEST SUMMARY ===")
@@ -134,89 +353,62 @@ def test_install():
         for test in failed_tests:
             print(f"  - {test['test_name']}: luaenv {test['command']}")
 
-    return results
+    return results, detailed_output
 
 def verify_uninstall(alias):
     """
     Verify that an installation with the given alias no longer exists.
     Returns True if the installation is gone, False if it still exists.
     """
-    output = execute_luaenv_command("list")
-    print(f"  Verification output: {output}")
-    print(f"  Looking for alias: {alias}")
-
-    # More detailed check
-    lines = output.splitlines()
-    for line in lines:
-        print(f"  Checking line: '{line}'")
-        # Look for the exact alias pattern, which should be format "alias: name)"
-        # This prevents matching substrings like "test_dll" in "test_dll_debug"
-        if f"(alias: {alias})" in line:
-            print(f"  FOUND ALIAS in line: {line}")
-            return False
-
-    # Do NOT use direct string search as it can cause false positives
-    # with substring matches (e.g., "test_dll" in "test_dll_debug")
-
-    return True
+    return alias not in list_aliases()
 
 def test_uninstall():
     """
     Test the luaenv uninstall command with different combinations of arguments.
+    Returns the results and the last 'luaenv list' output.
     """
     print("\n=== TESTING UNINSTALL COMMAND ===\n")
 
     results = []
 
-    # Run each test case
-    for i, test_case in enumerate(TEST_CASES):
-        uninstall_name = f"Uninstall {test_case['name']}"
-        print(f"Test {i+1}/{len(TEST_CASES)}: {uninstall_name}")
-        print(f"  Command: luaenv {test_case['uninstall_command']}")
-
-        start_time = time.time()
-        output = execute_luaenv_command(test_case['uninstall_command'])
-        end_time = time.time()
-
-        print(f"  Command output: {output}")
+    # Run the test cases, then check every alias with one 'list' per poll
+    case_runs = run_cases(TEST_CASES, "uninstall")
 
-        # Special handling for DLL build - it seems to need more time
-        wait_time = 15 if test_case['alias'] == 'test_dll' else 8
-        print(f"  Waiting {wait_time} seconds for uninstallation to complete...")
-        time.sleep(wait_time)  # Give more time for async processes to complete
+    # Cases whose output reports completion need no waiting; poll the rest
+    pending = [test_case for test_case, output, _ in case_runs
+               if UNINSTALL_DONE_MARKER not in output]
+    expected = {test_case['alias'] for test_case in pending}
 
-        # Debug: run list command directly to see what's happening
-        print(f"  Debug - Running list command directly:")
-        list_output = execute_luaenv_command("list")
-        print(f"  Debug - List command output: {list_output}")
+    def all_removed():
+        return not (list_aliases() & expected)
 
-        # Debug: explicitly look for the alias in the output
-        print(f"  Debug - Explicitly checking if alias '{test_case['alias']}' is in list output")
-        print(f"  Debug - Result: {test_case['alias'] in list_output}")
+    if pending:
+        print("\nWaiting for uninstallations to complete...")
+        wait_until(all_removed, timeout=max(map(case_timeout, pending)))
 
-        # Run list command a second time - sometimes first one might be cached
-        if test_case['alias'] == 'test_dll':
-            print(f"  Debug - Running list command a second time for DLL build:")
-            time.sleep(2)
-            list_output = execute_luaenv_command("list")
-            print(f"  Debug - Second list command output: {list_output}")
-            print(f"  Debug - Second check: {test_case['alias'] in list_output}")
+    # Final check covers every case, including the ones that reported completion
+    remaining = list_aliases() & {test_case['alias'] for test_case in TEST_CASES}
+    if remaining:
+        print(f"  Debug - Aliases still listed: {', '.join(sorted(remaining))}")
 
-        success = verify_uninstall(test_case['alias'])
+    log = io.StringIO()
+    for test_case, output, duration in case_runs:
+        uninstall_name = f"Uninstall {test_case['name']}"
+        success = test_case['alias'] not in remaining
 
         # Record result
         result = {
             "test_name": uninstall_name,
             "command": test_case["uninstall_command"],
             "success": success,
-            "duration_seconds": round(end_time - start_time, 1)
+            "duration_seconds": duration
         }
         results.append(result)
 
         # Print result
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"  Result: {status} (took {result['duration_seconds']} seconds)")
-        print()
+        print(f"  {uninstall_name}: {status} (took {result['duration_seconds']} seconds)", file=log)
+    print(log.getvalue())
 
     # Print summary
     print("\n=== UNINSTALL TEST SUMMARY ===")
@@ -230,7 +422,8 @@ def test_uninstall():
         for test in failed_tests:
             print(f"  - {test['test_name']}: luaenv {test['command']}")
 
-    return results
+    # Reuses the last poll's list output if it is still fresh
+    return results, cached_list()
 
 def test_specific_dll_build():
     """
@@ -246,22 +439,22 @@ def test_specific_dll_build():
 
     print(f"Testing: {test_case['name']}")
 
+    alias = test_case['alias']
+    timeout = case_timeout(test_case)
+
     # Clean up any existing installation with this alias first
     print("Cleaning up any existing installation first...")
     execute_luaenv_command(test_case['uninstall_command'])
-    time.sleep(3)
+    wait_for_alias(alias, False, timeout)
 
     # Install
     print(f"Running install command: luaenv {test_case['install_command']}")
     install_output = execute_luaenv_command(test_case['install_command'])
     print(f"Install output:\n{install_output}")
 
-    time.sleep(3)
-
     # Verify installation
-    list_output = execute_luaenv_command("list")
+    install_success, list_output = wait_for_alias(alias, True, timeout)
     print(f"List after install:\n{list_output}")
-    install_success = test_case['alias'] in list_output
     print(f"Installation verified: {install_success}")
 
     if not install_success:
@@ -273,21 +466,16 @@ def test_specific_dll_build():
     uninstall_output = execute_luaenv_command(test_case['uninstall_command'])
     print(f"Uninstall output:\n{uninstall_output}")
 
-    # Wait longer to make sure all processes complete
-    print("Waiting 10 seconds for uninstall to complete...")
-    time.sleep(10)
-
-    # Verify uninstall
-    list_output = execute_luaenv_command("list")
+    # Verify uninstall, polling until all processes complete
+    print(f"Waiting up to {timeout} seconds for uninstall to complete...")
+    uninstall_success, list_output = wait_for_alias(alias, False, timeout)
     print(f"List after uninstall:\n{list_output}")
-    uninstall_success = test_case['alias'] not in list_output
     print(f"Uninstall verified: {uninstall_success}")
 
     return uninstall_success
 
 if __name__ == "__main__":
     # Command line argument handling
-    import sys
     if len(sys.argv) > 1 and sys.argv[1] == "test_dll_only":
         # Run only the DLL test
         print("\n=== RUNNING ISOLATED DLL BUILD TEST ONLY ===\n")
@@ -295,19 +483,17 @@ if __name__ == "__main__":
         sys.exit(0)
 
     # Run the install tests
-    install_results = test_install()
+    install_results, list_output = test_install()
 
     # List all installations to verify
     print("\nVerifying all installations:")
-    list_output = execute_luaenv_command("list --detailed")
     print(list_output)
 
     # Run the uninstall tests
-    uninstall_results = test_uninstall()
+    uninstall_results, list_output = test_uninstall()
 
     # List remaining installations to verify
     print("\nVerifying remaining installations:")
-    list_output = execute_luaenv_command("list")
     print(list_output)
 
     # Optionally, run the specific DLL build test
@@ -0,0 +1,13 @@
+"""
+Shared pytest configuration for the LuaEnv test suite.
+
+Puts the backend directory on sys.path once per interpreter so test
+modules can import the backend scripts directly.
+"""
+
+import sys
+from pathlib import Path
+
+_BACKEND = str(Path(__file__).parent.parent / "backend")
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
@@ -7,111 +7,203 @@ like print statements or user input prompts.
 """
 
 import unittest
-import tempfile
-import shutil
 import sys
+from types import MappingProxyType
+from contextlib import ExitStack, redirect_stdout
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, NonCallableMock, DEFAULT
 from io import StringIO
 
-# Add backend to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+# Add backend directory to path for imports; under pytest conftest.py has
+# already done this, so only direct unittest runs need it
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
 
 # Import the module to test
 import download_lua_luarocks
 from download_manager import DownloadManager
 
+# Text expected in the --help and --config output
+USAGE_MARKER = 'Usage:'
+CONFIG_MARKER = 'Configuration:'
+
+# Fake paths used by the extraction tests, built once at import time
+SOURCE_DIR = Path('/tmp/source')
+EXTRACTED_DIR = Path('/tmp/extracted')
+EXPECTED_LUA_DIR = EXTRACTED_DIR / 'lua-5.4.8'
+EXPECTED_TESTS_DIR = EXTRACTED_DIR / 'lua-5.4.8-tests'
+EXPECTED_LUAROCKS_DIR = EXTRACTED_DIR / 'luarocks-3.12.2'
+MAIN_EXTRACTED_DIR = Path('/extracted')
+
+
+def printed_text(print_calls):
+    """Join the first positional argument of each print call into one string."""
+    return '\n'.join(str(c.args[0]) for c in print_calls if c.args)
+
 
 class TestDownloadScript(unittest.TestCase):
     """Integration tests for download_lua_luarocks.py script."""
 
+    # Module under test; patched with patch.object to skip string target lookups
+    _MOD = download_lua_luarocks
+    _DM_PATCHER = patch.object(_MOD, 'DownloadManager')
+
+    # Sample data shared by the tests; the code under test only reads it
+    _SAMPLE_URLS = {
+        'lua': 'http://test.com/lua.tar.gz',
+        'luarocks': 'http://test.com/luarocks.zip',
+        'lua_tests': 'http://test.com/tests.tar.gz'
+    }
+    _SAMPLE_FILENAMES = {'lua': 'lua.tar.gz', 'luarocks': 'luarocks.zip', 'lua_tests': 'tests.tar.gz'}
+    _SAMPLE_DOWNLOADED = [
+        {
+            'key': 'lua-5.4.8_luarocks-3.12.2',
+            'created': '2025-01-01T00:00:00',
+            'formatted_size': '10.5 MB',
+            'file_count': 3
+        }
+    ]
+    _SAMPLE_LIST_SUMMARY = {
+        'combination_count': 1,
+        'lua_versions': 1,
+        'luarocks_versions': 1,
+        'formatted_size': '10.5 MB'
+    }
+    _SAMPLE_REGISTRY_INFO = {
+        'registry_file': '/path/to/registry.json',
+        'base_dir': '/downloads',
+        'lua_dir': '/downloads/lua',
+        'luarocks_dir': '/downloads/luarocks',
+        'combination_count': 2,
+        'lua_versions': 1,
+        'luarocks_versions': 2,
+        'formatted_size': '15.2 MB'
+    }
+
+    # Config check results; immutable so they can be shared between tests
+    _COMPAT_OK = (True, ())
+    _COMPAT_WARN = (True, ("Minor version mismatch",))
+    _COMPAT_FAIL = (False, ("Version incompatible",))
+    _VALIDATE_OK = (True, MappingProxyType({}))
+    _VALIDATE_FAIL_LUA = (False, MappingProxyType({
+        'lua': MappingProxyType({'exists': False, 'message': 'URL not found'})
+    }))
+
+    @classmethod
+    def setUpClass(cls):
+        """Snapshot state shared by every test."""
+        cls._ORIGINAL_ARGV = sys.argv.copy()
+
     def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.original_argv = sys.argv.copy()
+        """Silence script output; tests assert on mocks, not printed text."""
+        silencer = redirect_stdout(StringIO())
+        silencer.__enter__()
+        self.addCleanup(silencer.__exit__, None, None, None)
 
     def tearDown(self):
         """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-        sys.argv = self.original_argv
+        sys.argv = self._ORIGINAL_ARGV.copy()
+
+    def _capture_main(self, argv):
+        """Run main() with argv and return (exit_code, print calls)."""
+        saved_argv = sys.argv
+        sys.argv = list(argv)
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(patch.object(self._MOD, 'DownloadManager'))
+                mock_print = stack.enter_context(patch('builtins.print'))
+                try:
+                    download_lua_luarocks.main()
+                    exit_code = None
+                except SystemExit as e:
+                    exit_code = e.code
+        finally:
+            sys.argv = saved_argv
+        return exit_code, tuple(mock_print.call_args_list)
+
+    def _start_dm_patch(self):
+        """Patch the module's DownloadManager class for the rest of the test.
+
+        The patcher is built once per class and restarted by each test.
+        """
+        mock_dm_class = self._DM_PATCHER.start()
+        self.addCleanup(self._DM_PATCHER.stop)
+        return mock_dm_class
+
+    @staticmethod
+    def _new_dm_mock():
+        """Return a DownloadManager instance double restricted to its real API."""
+        return NonCallableMock(spec=DownloadManager)
+
+    def _patch_module(self, *names, **return_values):
+        """Patch several download_lua_luarocks attributes with one patcher.
+
+        Attributes given as keywords get that return value. Returns the
+        created mocks keyed by attribute name; they are undone on cleanup.
+        """
+        targets = dict.fromkeys(names + tuple(return_values), DEFAULT)
+        patcher = patch.multiple(self._MOD, **targets)
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        for name, value in return_values.items():
+            mocks[name].return_value = value
+        return mocks
 
     # ==========================================
     # CLI Argument Parsing Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_help_argument(self, mock_print, mock_dm_class):
+    def test_help_argument(self):
         """Test --help argument displays help and exits."""
-        sys.argv = ['download_lua_luarocks.py', '--help']
+        code, prints = self._capture_main(('download_lua_luarocks.py', '--help'))
 
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
-
-        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(code, 0)
         # Verify help content was printed
-        mock_print.assert_called()
-        help_calls = [call for call in mock_print.call_args_list if 'Usage:' in str(call)]
-        self.assertTrue(len(help_calls) > 0, "Help usage information should be displayed")
+        self.assertTrue(prints, "print should have been called")
+        self.assertIn(USAGE_MARKER, download_lua_luarocks._HELP_TEXT,
+                      "Help usage information should be displayed")
+        self.assertIn(download_lua_luarocks._HELP_TEXT, printed_text(prints))
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_config_argument(self, mock_print, mock_dm_class):
+    def test_config_argument(self):
         """Test --config argument shows configuration and exits."""
-        sys.argv = ['download_lua_luarocks.py', '--config']
-
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
+        code, prints = self._capture_main(('download_lua_luarocks.py', '--config'))
 
-        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(code, 0)
         # Verify configuration was printed
-        mock_print.assert_called()
-        config_calls = [call for call in mock_print.call_args_list if 'Configuration:' in str(call)]
-        self.assertTrue(len(config_calls) > 0, "Configuration information should be displayed")
+        self.assertTrue(prints, "print should have been called")
+        self.assertIn(CONFIG_MARKER, printed_text(prints),
+                      "Configuration information should be displayed")
 
-    @patch('download_lua_luarocks.DownloadManager')
-    def test_list_argument_no_downloads(self, mock_dm_class):
+    def test_list_argument_no_downloads(self):
         """Test --list argument when no downloads exist."""
+        mock_dm_class = self._start_dm_patch()
         # Mock DownloadManager instance
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.list_downloaded_versions.return_value = []
         mock_dm_class.return_value = mock_dm
 
         sys.argv = ['download_lua_luarocks.py', '--list']
 
-        with patch('builtins.print') as mock_print:
-            with self.assertRaises(SystemExit) as cm:
-                download_lua_luarocks.main()
+        with self.assertRaises(SystemExit) as cm:
+            download_lua_luarocks.main()
 
         self.assertEqual(cm.exception.code, 0)
         mock_dm.list_downloaded_versions.assert_called_once()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    def test_list_argument_with_downloads(self, mock_dm_class):
+    def test_list_argument_with_downloads(self):
         """Test --list argument when downloads exist."""
+        mock_dm_class = self._start_dm_patch()
         # Mock DownloadManager instance with sample data
-        mock_dm = MagicMock()
-        mock_dm.list_downloaded_versions.return_value = [
-            {
-                'key': 'lua-5.4.8_luarocks-3.12.2',
-                'created': '2025-01-01T00:00:00',
-                'formatted_size': '10.5 MB',
-                'file_count': 3
-            }
-        ]
-        mock_dm.get_registry_info.return_value = {
-            'combination_count': 1,
-            'lua_versions': 1,
-            'luarocks_versions': 1,
-            'formatted_size': '10.5 MB'
-        }
+        mock_dm = self._new_dm_mock()
+        mock_dm.list_downloaded_versions.return_value = self._SAMPLE_DOWNLOADED
+        mock_dm.get_registry_info.return_value = self._SAMPLE_LIST_SUMMARY
         mock_dm_class.return_value = mock_dm
 
         sys.argv = ['download_lua_luarocks.py', '--list']
 
-        with patch('builtins.print') as mock_print:
-            with self.assertRaises(SystemExit) as cm:
-                download_lua_luarocks.main()
+        with self.assertRaises(SystemExit) as cm:
+            download_lua_luarocks.main()
 
         self.assertEqual(cm.exception.code, 0)
         mock_dm.list_downloaded_versions.assert_called_once()
@@ -121,24 +213,23 @@ class TestDownloadScript(unittest.TestCase):
     # Download Orchestration Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    def test_download_function_already_downloaded(self, mock_check_compat, mock_validate, mock_dm_class):
+    @patch.object(_MOD, 'validate_current_configuration')
+    @patch.object(_MOD, 'check_version_compatibility')
+    def test_download_function_already_downloaded(self, mock_check_compat, mock_validate):
         """Test download() function when version is already downloaded."""
+        mock_dm_class = self._start_dm_patch()
         # Mock version compatibility check
-        mock_check_compat.return_value = (True, [])
+        mock_check_compat.return_value = self._COMPAT_OK
 
         # Mock URL validation
-        mock_validate.return_value = (True, {})
+        mock_validate.return_value = self._VALIDATE_OK
 
         # Mock DownloadManager
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = True
         mock_dm_class.return_value = mock_dm
 
-        with patch('builtins.print'):
-            result = download_lua_luarocks.download()
+        result = download_lua_luarocks.download()
 
         # Verify the download manager was returned
         self.assertEqual(result, mock_dm)
@@ -150,31 +241,25 @@ class TestDownloadScript(unittest.TestCase):
         # Verify download_version was NOT called (already downloaded)
         mock_dm.download_version.assert_not_called()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    @patch('download_lua_luarocks.get_lua_url', return_value='http://test.com/lua.tar.gz')
-    @patch('download_lua_luarocks.get_luarocks_url', return_value='http://test.com/luarocks.zip')
-    @patch('download_lua_luarocks.get_lua_tests_url', return_value='http://test.com/tests.tar.gz')
-    @patch('download_lua_luarocks.get_download_filenames', return_value={'lua': 'lua.tar.gz', 'luarocks': 'luarocks.zip', 'lua_tests': 'tests.tar.gz'})
-    def test_download_function_new_download_success(self, mock_filenames, mock_tests_url,
-                                                    mock_luarocks_url, mock_lua_url,
-                                                    mock_check_compat, mock_validate, mock_dm_class):
+    def test_download_function_new_download_success(self):
         """Test download() function for new successful download."""
-        # Mock version compatibility check
-        mock_check_compat.return_value = (True, [])
-
-        # Mock URL validation
-        mock_validate.return_value = (True, {})
+        mocks = self._patch_module(
+            'DownloadManager',
+            check_version_compatibility=self._COMPAT_OK,  # Version compatibility check
+            validate_current_configuration=self._VALIDATE_OK,  # URL validation
+            get_lua_url=self._SAMPLE_URLS['lua'],
+            get_luarocks_url=self._SAMPLE_URLS['luarocks'],
+            get_lua_tests_url=self._SAMPLE_URLS['lua_tests'],
+            get_download_filenames=self._SAMPLE_FILENAMES
+        )
 
         # Mock DownloadManager
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = False
         mock_dm.download_version.return_value = (True, "Download successful")
-        mock_dm_class.return_value = mock_dm
+        mocks['DownloadManager'].return_value = mock_dm
 
-        with patch('builtins.print'):
-            result = download_lua_luarocks.download()
+        result = download_lua_luarocks.download()
 
         # Verify the download manager was returned
         self.assertEqual(result, mock_dm)
@@ -183,51 +268,47 @@ class TestDownloadScript(unittest.TestCase):
         mock_dm.download_version.assert_called_once()
 
         # Verify URLs were gathered
-        mock_lua_url.assert_called_once()
-        mock_luarocks_url.assert_called_once()
-        mock_tests_url.assert_called_once()
-        mock_filenames.assert_called_once()
-
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    def test_download_function_version_compatibility_error(self, mock_check_compat, mock_validate, mock_dm_class):
+        mocks['get_lua_url'].assert_called_once()
+        mocks['get_luarocks_url'].assert_called_once()
+        mocks['get_lua_tests_url'].assert_called_once()
+        mocks['get_download_filenames'].assert_called_once()
+
+    @patch.object(_MOD, 'validate_current_configuration')
+    @patch.object(_MOD, 'check_version_compatibility')
+    def test_download_function_version_compatibility_error(self, mock_check_compat, mock_validate):
         """Test download() function when version compatibility fails."""
+        self._start_dm_patch()
         # Mock version compatibility failure
-        mock_check_compat.return_value = (False, ["Version incompatible"])
+        mock_check_compat.return_value = self._COMPAT_FAIL
 
         # Mock user input to cancel
         with patch('builtins.input', return_value='n'):
-            with patch('builtins.print'):
-                with self.assertRaises(SystemExit) as cm:
-                    download_lua_luarocks.download()
+            with self.assertRaises(SystemExit) as cm:
+                download_lua_luarocks.download()
 
         self.assertEqual(cm.exception.code, 1)
         mock_check_compat.assert_called_once()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    def test_download_function_url_validation_error(self, mock_check_compat, mock_validate, mock_dm_class):
+    @patch.object(_MOD, 'validate_current_configuration')
+    @patch.object(_MOD, 'check_version_compatibility')
+    def test_download_function_url_validation_error(self, mock_check_compat, mock_validate):
         """Test download() function when URL validation fails."""
+        mock_dm_class = self._start_dm_patch()
         # Mock version compatibility success
-        mock_check_compat.return_value = (True, [])
+        mock_check_compat.return_value = self._COMPAT_OK
 
         # Mock DownloadManager
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = False
         mock_dm_class.return_value = mock_dm
 
         # Mock URL validation failure
-        mock_validate.return_value = (False, {
-            'lua': {'exists': False, 'message': 'URL not found'}
-        })
+        mock_validate.return_value = self._VALIDATE_FAIL_LUA
 
         # Mock user input to cancel
         with patch('builtins.input', return_value='n'):
-            with patch('builtins.print'):
-                with self.assertRaises(SystemExit) as cm:
-                    download_lua_luarocks.download()
+            with self.assertRaises(SystemExit) as cm:
+                download_lua_luarocks.download()
 
         self.assertEqual(cm.exception.code, 1)
         mock_validate.assert_called_once()
@@ -236,67 +317,53 @@ class TestDownloadScript(unittest.TestCase):
     # Extraction Callback Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.ensure_extracted_folder')
-    @patch('download_lua_luarocks.get_lua_dir_name', return_value='lua-5.4.8')
-    @patch('download_lua_luarocks.get_lua_tests_dir_name', return_value='lua-5.4.8-tests')
-    @patch('download_lua_luarocks.get_luarocks_dir_name', return_value='luarocks-3.12.2')
+    @patch.object(_MOD, 'ensure_extracted_folder')
+    @patch.object(_MOD, 'get_lua_dir_name', return_value='lua-5.4.8')
+    @patch.object(_MOD, 'get_lua_tests_dir_name', return_value='lua-5.4.8-tests')
+    @patch.object(_MOD, 'get_luarocks_dir_name', return_value='luarocks-3.12.2')
     def test_create_extraction_callback_lua_detection(self, mock_luarocks_name, mock_tests_name,
                                                       mock_lua_name, mock_ensure_folder):
         """Test extraction callback correctly identifies file types."""
-        mock_extracted_folder = Path('/tmp/extracted')
-        mock_ensure_folder.return_value = mock_extracted_folder
+        mock_ensure_folder.return_value = EXTRACTED_DIR
 
         callback = download_lua_luarocks.create_extraction_callback()
 
         # Test Lua source detection
-        result = callback(Path('/tmp/source'), 'lua-5.4.8.tar.gz')
-        expected = mock_extracted_folder / 'lua-5.4.8'
-        self.assertEqual(result, expected)
+        self.assertEqual(callback(SOURCE_DIR, 'lua-5.4.8.tar.gz'), EXPECTED_LUA_DIR)
 
         # Test Lua tests detection
-        result = callback(Path('/tmp/source'), 'lua-5.4.8-tests.tar.gz')
-        expected = mock_extracted_folder / 'lua-5.4.8-tests'
-        self.assertEqual(result, expected)
+        self.assertEqual(callback(SOURCE_DIR, 'lua-5.4.8-tests.tar.gz'), EXPECTED_TESTS_DIR)
 
         # Test LuaRocks detection
-        result = callback(Path('/tmp/source'), 'luarocks-3.12.2-win64.zip')
-        expected = mock_extracted_folder / 'luarocks-3.12.2'
-        self.assertEqual(result, expected)
+        self.assertEqual(callback(SOURCE_DIR, 'luarocks-3.12.2-win64.zip'), EXPECTED_LUAROCKS_DIR)
 
         # Test unknown file type
-        result = callback(Path('/tmp/source'), 'unknown-file.txt')
-        self.assertIsNone(result)
+        self.assertIsNone(callback(SOURCE_DIR, 'unknown-file.txt'))
 
     # ==========================================
     # Error Handling Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    @patch('download_lua_luarocks.get_lua_url', return_value='http://test.com/lua.tar.gz')
-    @patch('download_lua_luarocks.get_luarocks_url', return_value='http://test.com/luarocks.zip')
-    @patch('download_lua_luarocks.get_lua_tests_url', return_value='http://test.com/tests.tar.gz')
-    @patch('download_lua_luarocks.get_download_filenames', return_value={'lua': 'lua.tar.gz'})
-    def test_download_function_download_failure(self, mock_filenames, mock_tests_url,
-                                                mock_luarocks_url, mock_lua_url,
-                                                mock_check_compat, mock_validate, mock_dm_class):
+    def test_download_function_download_failure(self):
         """Test download() function when download fails."""
-        # Mock version compatibility success
-        mock_check_compat.return_value = (True, [])
-
-        # Mock URL validation success
-        mock_validate.return_value = (True, {})
+        mocks = self._patch_module(
+            'DownloadManager',
+            check_version_compatibility=self._COMPAT_OK,  # Version compatibility success
+            validate_current_configuration=self._VALIDATE_OK,  # URL validation success
+            get_lua_url=self._SAMPLE_URLS['lua'],
+            get_luarocks_url=self._SAMPLE_URLS['luarocks'],
+            get_lua_tests_url=self._SAMPLE_URLS['lua_tests'],
+            get_download_filenames=self._SAMPLE_FILENAMES
+        )
 
         # Mock DownloadManager with download failure
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = False
         mock_dm.download_version.return_value = (False, "Network error")
-        mock_dm_class.return_value = mock_dm
+        mocks['DownloadManager'].return_value = mock_dm
 
-        with patch('builtins.print'):
-            with self.assertRaises(SystemExit) as cm:
-                download_lua_luarocks.download()
+        with self.assertRaises(SystemExit) as cm:
+            download_lua_luarocks.download()
 
         self.assertEqual(cm.exception.code, 1)
         mock_dm.download_version.assert_called_once()
@@ -305,68 +372,36 @@ class TestDownloadScript(unittest.TestCase):
     # Additional CLI Options Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_cleanup_argument_default(self, mock_print, mock_dm_class):
-        """Test --cleanup argument with default behavior (keep 3)."""
-        mock_dm = MagicMock()
-        mock_dm.cleanup_old_versions.return_value = (True, "Cleaned up 2 old versions")
-        mock_dm_class.return_value = mock_dm
-
-        sys.argv = ['download_lua_luarocks.py', '--cleanup']
-
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
-
-        self.assertEqual(cm.exception.code, 0)
-        mock_dm.cleanup_old_versions.assert_called_once_with(keep_latest=3)
-
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_cleanup_argument_all(self, mock_print, mock_dm_class):
-        """Test --cleanup --all argument (keep 1)."""
-        mock_dm = MagicMock()
-        mock_dm.cleanup_old_versions.return_value = (True, "Cleaned up 5 old versions")
-        mock_dm_class.return_value = mock_dm
-
-        sys.argv = ['download_lua_luarocks.py', '--cleanup', '--all']
-
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
-
-        self.assertEqual(cm.exception.code, 0)
-        mock_dm.cleanup_old_versions.assert_called_once_with(keep_latest=1)
-
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_cleanup_argument_failure(self, mock_print, mock_dm_class):
-        """Test --cleanup argument when cleanup fails."""
-        mock_dm = MagicMock()
-        mock_dm.cleanup_old_versions.return_value = (False, "Failed to clean up")
+    def test_cleanup_argument_variants(self):
+        """Test --cleanup default (keep 3), --cleanup --all (keep 1) and failure."""
+        mock_dm_class = self._start_dm_patch()
+        # (extra argv, cleanup result, expected exit code, expected call kwargs)
+        cases = [
+            (['--cleanup'], (True, "Cleaned up 2 old versions"), 0, {'keep_latest': 3}),
+            (['--cleanup', '--all'], (True, "Cleaned up 5 old versions"), 0, {'keep_latest': 1}),
+            (['--cleanup'], (False, "Failed to clean up"), 1, None),
+        ]
+        mock_dm = self._new_dm_mock()
         mock_dm_class.return_value = mock_dm
 
-        sys.argv = ['download_lua_luarocks.py', '--cleanup']
+        for argv, cleanup_result, exit_code, call_kwargs in cases:
+            with self.subTest(argv=argv, result=cleanup_result):
+                mock_dm.reset_mock()
+                mock_dm.cleanup_old_versions.return_value = cleanup_result
+                sys.argv = ['download_lua_luarocks.py', *argv]
 
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
+                with self.assertRaises(SystemExit) as cm:
+                    download_lua_luarocks.main()
 
-        self.assertEqual(cm.exception.code, 1)
+                self.assertEqual(cm.exception.code, exit_code)
+                if call_kwargs is not None:
+                    mock_dm.cleanup_old_versions.assert_called_once_with(**call_kwargs)
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_registry_info_argument(self, mock_print, mock_dm_class):
+    def test_registry_info_argument(self):
         """Test --registry-info argument."""
-        mock_dm = MagicMock()
-        mock_dm.get_registry_info.return_value = {
-            'registry_file': '/path/to/registry.json',
-            'base_dir': '/downloads',
-            'lua_dir': '/downloads/lua',
-            'luarocks_dir': '/downloads/luarocks',
-            'combination_count': 2,
-            'lua_versions': 1,
-            'luarocks_versions': 2,
-            'formatted_size': '15.2 MB'
-        }
+        mock_dm_class = self._start_dm_patch()
+        mock_dm = self._new_dm_mock()
+        mock_dm.get_registry_info.return_value = self._SAMPLE_REGISTRY_INFO
         mock_dm_class.return_value = mock_dm
 
         sys.argv = ['download_lua_luarocks.py', '--registry-info']
@@ -377,9 +412,8 @@ class TestDownloadScript(unittest.TestCase):
         self.assertEqual(cm.exception.code, 0)
         mock_dm.get_registry_info.assert_called_once()
 
-    @patch('download_lua_luarocks.list_extracted_contents')
-    @patch('builtins.print')
-    def test_list_extracted_argument(self, mock_print, mock_list):
+    @patch.object(_MOD, 'list_extracted_contents')
+    def test_list_extracted_argument(self, mock_list):
         """Test --list-extracted argument."""
         sys.argv = ['download_lua_luarocks.py', '--list-extracted']
 
@@ -389,65 +423,48 @@ class TestDownloadScript(unittest.TestCase):
         self.assertEqual(cm.exception.code, 0)
         mock_list.assert_called_once()
 
-    @patch('download_lua_luarocks.clean_extracted_folder')
-    @patch('builtins.print')
-    def test_clean_extracted_argument(self, mock_print, mock_clean):
-        """Test --clean-extracted argument with confirmation."""
-        mock_clean.return_value = True
-        sys.argv = ['download_lua_luarocks.py', '--clean-extracted']
-
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
-
-        self.assertEqual(cm.exception.code, 0)
-        mock_clean.assert_called_once_with(confirm=True)
-
-    @patch('download_lua_luarocks.clean_extracted_folder')
-    @patch('builtins.print')
-    def test_clean_extracted_force_argument(self, mock_print, mock_clean):
-        """Test --clean-extracted --force argument without confirmation."""
-        mock_clean.return_value = True
-        sys.argv = ['download_lua_luarocks.py', '--clean-extracted', '--force']
-
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
-
-        self.assertEqual(cm.exception.code, 0)
-        mock_clean.assert_called_once_with(confirm=False)
+    @patch.object(_MOD, 'clean_extracted_folder')
+    def test_clean_extracted_variants(self, mock_clean):
+        """Test --clean-extracted with confirmation, with --force, and on failure."""
+        # (extra argv, clean result, expected exit code, expected call kwargs)
+        cases = [
+            (['--clean-extracted'], True, 0, {'confirm': True}),
+            (['--clean-extracted', '--force'], True, 0, {'confirm': False}),
+            (['--clean-extracted', '--force'], False, 1, None),
+        ]
 
-    @patch('download_lua_luarocks.clean_extracted_folder')
-    @patch('builtins.print')
-    def test_clean_extracted_failure(self, mock_print, mock_clean):
-        """Test --clean-extracted when cleaning fails."""
-        mock_clean.return_value = False
-        sys.argv = ['download_lua_luarocks.py', '--clean-extracted', '--force']
+        for argv, clean_result, exit_code, call_kwargs in cases:
+            with self.subTest(argv=argv, result=clean_result):
+                mock_clean.reset_mock()
+                mock_clean.return_value = clean_result
+                sys.argv = ['download_lua_luarocks.py', *argv]
 
-        with self.assertRaises(SystemExit) as cm:
-            download_lua_luarocks.main()
+                with self.assertRaises(SystemExit) as cm:
+                    download_lua_luarocks.main()
 
-        self.assertEqual(cm.exception.code, 1)
+                self.assertEqual(cm.exception.code, exit_code)
+                if call_kwargs is not None:
+                    mock_clean.assert_called_once_with(**call_kwargs)
 
     # ==========================================
     # Re-extraction Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.clean_extracted_folder')
-    @patch('download_lua_luarocks.ensure_extracted_folder')
-    @patch('download_lua_luarocks.get_lua_dir_name', return_value='lua-5.4.8')
-    @patch('download_lua_luarocks.get_lua_tests_dir_name', return_value='lua-5.4.8-tests')
-    @patch('download_lua_luarocks.get_luarocks_dir_name', return_value='luarocks-3.12.2')
-    @patch('builtins.print')
-    def test_re_extract_success(self, mock_print, mock_luarocks_name, mock_tests_name,
-                               mock_lua_name, mock_ensure, mock_clean, mock_dm_class):
+    def test_re_extract_success(self):
         """Test --re-extract argument with successful re-extraction."""
-        mock_dm = MagicMock()
+        mocks = self._patch_module(
+            'DownloadManager',
+            clean_extracted_folder=True,
+            ensure_extracted_folder=MAIN_EXTRACTED_DIR,
+            get_lua_dir_name='lua-5.4.8',
+            get_lua_tests_dir_name='lua-5.4.8-tests',
+            get_luarocks_dir_name='luarocks-3.12.2'
+        )
+
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = True
         mock_dm.extract_version.return_value = (True, "Extraction successful")
-        mock_dm_class.return_value = mock_dm
-
-        mock_ensure.return_value = Path('/extracted')
-        mock_clean.return_value = True
+        mocks['DownloadManager'].return_value = mock_dm
 
         sys.argv = ['download_lua_luarocks.py', '--re-extract']
 
@@ -456,14 +473,13 @@ class TestDownloadScript(unittest.TestCase):
 
         self.assertEqual(cm.exception.code, 0)
         mock_dm.is_downloaded.assert_called_once()
-        mock_clean.assert_called_once_with(confirm=False)
+        mocks['clean_extracted_folder'].assert_called_once_with(confirm=False)
         mock_dm.extract_version.assert_called_once()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('builtins.print')
-    def test_re_extract_not_downloaded(self, mock_print, mock_dm_class):
+    def test_re_extract_not_downloaded(self):
         """Test --re-extract when version is not downloaded."""
-        mock_dm = MagicMock()
+        mock_dm_class = self._start_dm_patch()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = False
         mock_dm_class.return_value = mock_dm
 
@@ -476,12 +492,11 @@ class TestDownloadScript(unittest.TestCase):
         mock_dm.is_downloaded.assert_called_once()
         mock_dm.extract_version.assert_not_called()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.clean_extracted_folder')
-    @patch('builtins.print')
-    def test_re_extract_failure(self, mock_print, mock_clean, mock_dm_class):
+    @patch.object(_MOD, 'clean_extracted_folder')
+    def test_re_extract_failure(self, mock_clean):
         """Test --re-extract when extraction fails."""
-        mock_dm = MagicMock()
+        mock_dm_class = self._start_dm_patch()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = True
         mock_dm.extract_version.return_value = (False, "Extraction failed")
         mock_dm_class.return_value = mock_dm
@@ -500,27 +515,25 @@ class TestDownloadScript(unittest.TestCase):
     # Main Function Flow Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.download')
-    @patch('download_lua_luarocks.create_extraction_callback')
-    @patch('download_lua_luarocks.ensure_extracted_folder')
-    @patch('download_lua_luarocks.get_lua_dir_name', return_value='lua-5.4.8')
-    @patch('download_lua_luarocks.get_lua_tests_dir_name', return_value='lua-5.4.8-tests')
-    @patch('download_lua_luarocks.get_luarocks_dir_name', return_value='luarocks-3.12.2')
-    @patch('builtins.print')
-    def test_main_function_success(self, mock_print, mock_luarocks_name, mock_tests_name,
-                                  mock_lua_name, mock_ensure, mock_callback_func, mock_download):
+    def test_main_function_success(self):
         """Test main function execution with successful download and extraction."""
+        mocks = self._patch_module(
+            'download',
+            'create_extraction_callback',
+            ensure_extracted_folder=MAIN_EXTRACTED_DIR,  # Mock extracted folder
+            get_lua_dir_name='lua-5.4.8',
+            get_lua_tests_dir_name='lua-5.4.8-tests',
+            get_luarocks_dir_name='luarocks-3.12.2'
+        )
+
         # Mock successful download
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.extract_version.return_value = (True, "Extraction successful")
-        mock_download.return_value = mock_dm
+        mocks['download'].return_value = mock_dm
 
         # Mock callback creation
         mock_callback = MagicMock()
-        mock_callback_func.return_value = mock_callback
-
-        # Mock extracted folder
-        mock_ensure.return_value = Path('/extracted')
+        mocks['create_extraction_callback'].return_value = mock_callback
 
         # Set empty argv to trigger main function
         sys.argv = ['download_lua_luarocks.py']
@@ -529,17 +542,16 @@ class TestDownloadScript(unittest.TestCase):
         download_lua_luarocks.main()
 
         # Verify the flow
-        mock_download.assert_called_once()
-        mock_callback_func.assert_called_once()
+        mocks['download'].assert_called_once()
+        mocks['create_extraction_callback'].assert_called_once()
         mock_dm.extract_version.assert_called_once()
 
-    @patch('download_lua_luarocks.download')
-    @patch('download_lua_luarocks.create_extraction_callback')
-    @patch('builtins.print')
-    def test_main_function_extraction_failure(self, mock_print, mock_callback_func, mock_download):
+    @patch.object(_MOD, 'download')
+    @patch.object(_MOD, 'create_extraction_callback')
+    def test_main_function_extraction_failure(self, mock_callback_func, mock_download):
         """Test main function execution when extraction fails."""
         # Mock successful download but failed extraction
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.extract_version.return_value = (False, "Extraction failed")
         mock_download.return_value = mock_dm
 
@@ -560,52 +572,48 @@ class TestDownloadScript(unittest.TestCase):
     # User Input Tests
     # ==========================================
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    def test_download_function_compatibility_warning_proceed(self, mock_check_compat, mock_validate, mock_dm_class):
+    @patch.object(_MOD, 'validate_current_configuration')
+    @patch.object(_MOD, 'check_version_compatibility')
+    def test_download_function_compatibility_warning_proceed(self, mock_check_compat, mock_validate):
         """Test download() function when user chooses to proceed despite warnings."""
+        mock_dm_class = self._start_dm_patch()
         # Mock version compatibility with warnings but still compatible
-        mock_check_compat.return_value = (True, ["Minor version mismatch"])
+        mock_check_compat.return_value = self._COMPAT_WARN
 
         # Mock URL validation success
-        mock_validate.return_value = (True, {})
+        mock_validate.return_value = self._VALIDATE_OK
 
         # Mock DownloadManager
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = True
         mock_dm_class.return_value = mock_dm
 
         with patch('builtins.input', return_value='y'):
-            with patch('builtins.print'):
-                result = download_lua_luarocks.download()
+            result = download_lua_luarocks.download()
 
         # Should complete successfully
         self.assertEqual(result, mock_dm)
         mock_check_compat.assert_called_once()
 
-    @patch('download_lua_luarocks.DownloadManager')
-    @patch('download_lua_luarocks.validate_current_configuration')
-    @patch('download_lua_luarocks.check_version_compatibility')
-    def test_download_function_url_validation_proceed(self, mock_check_compat, mock_validate, mock_dm_class):
+    @patch.object(_MOD, 'validate_current_configuration')
+    @patch.object(_MOD, 'check_version_compatibility')
+    def test_download_function_url_validation_proceed(self, mock_check_compat, mock_validate):
         """Test download() function when user chooses to proceed despite URL validation errors."""
+        mock_dm_class = self._start_dm_patch()
         # Mock version compatibility success
-        mock_check_compat.return_value = (True, [])
+        mock_check_compat.return_value = self._COMPAT_OK
 
         # Mock URL validation failure
-        mock_validate.return_value = (False, {
-            'lua': {'exists': False, 'message': 'URL not found'}
-        })
+        mock_validate.return_value = self._VALIDATE_FAIL_LUA
 
         # Mock DownloadManager
-        mock_dm = MagicMock()
+        mock_dm = self._new_dm_mock()
         mock_dm.is_downloaded.return_value = False  # Not downloaded, so validation will be called
         mock_dm.download_version.return_value = (True, "Download successful")  # Mock the download
         mock_dm_class.return_value = mock_dm
 
         with patch('builtins.input', return_value='y'):
-            with patch('builtins.print'):
-                result = download_lua_luarocks.download()
+            result = download_lua_luarocks.download()
 
         # Should complete successfully despite URL issues
         self.assertEqual(result, mock_dm)
@@ -4,19 +4,74 @@ Comprehensive test runner for the Lua MSVC Build project.
 Runs all unit and integration tests.
 """
 
+import os
 import sys
+import subprocess
 import unittest
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project directories to the Python path
 project_root = Path(__file__).parent.parent.absolute()
 backend_dir = project_root / "backend"
 tests_dir = project_root / "tests"
-
-for path in [project_root, backend_dir, tests_dir]:
-    if str(path) not in sys.path:
-        sys.path.insert(0, str(path))
+unit_tests_dir = tests_dir / "unit"
+integration_tests_dir = tests_dir / "integration"
+
+_missing_paths = [str(p) for p in (project_root, backend_dir, tests_dir) if str(p) not in sys.path]
+sys.path[0:0] = _missing_paths
+
+def iter_tests(suite):
+    """Yield the individual test cases of a (possibly nested) suite."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+def run_tests_parallel(tests, jobs, verbosity, failfast=False):
+    """Run the given test cases split across `jobs` unittest subprocesses.
+
+    Tests are dealt round-robin into buckets; each bucket runs in its own
+    interpreter and the combined output is printed once every bucket is done.
+    With failfast, each worker stops at its own first failure.
+    Returns True if every bucket passed.
+    """
+    test_ids = [test.id() for test in tests]
+    buckets = [test_ids[i::jobs] for i in range(jobs) if test_ids[i::jobs]]
+
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(backend_dir), str(unit_tests_dir), str(integration_tests_dir),
+                      env.get("PYTHONPATH")])
+    )
+    command = [sys.executable, "-m", "unittest", "--buffer"]
+    if failfast:
+        command.append("--failfast")
+    if verbosity > 1:
+        command.append("-v")
+
+    def run_bucket(bucket):
+        return subprocess.run(command + bucket, cwd=project_root, env=env,
+                              capture_output=True, text=True)
+
+    # Threads are enough here: each one only waits on its subprocess
+    with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+        results = list(executor.map(run_bucket, buckets))
+
+    for index, result in enumerate(results, 1):
+        print(f"--- Worker {index}/{len(results)} ({len(buckets[index - 1])} tests) ---")
+        print(result.stderr.rstrip())
+
+    failed = [i for i, result in enumerate(results, 1) if result.returncode != 0]
+    print("=" * 60)
+    if failed:
+        print(f"✗ {len(failed)} of {len(results)} workers reported failures: "
+              f"{', '.join(str(i) for i in failed)}")
+    else:
+        print(f"✓ All {len(test_ids)} tests passed!")
+    return not failed
 
 def main():
     """Run all unit and integration tests."""
@@ -25,6 +80,11 @@ def main():
     parser.add_argument("--integration", action="store_true", help="Run only integration tests")
     parser.add_argument("--list", "-l", action="store_true", help="List all available tests")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--failfast", "-f", action="store_true",
+                        help="Stop at the first failure or error")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Run tests in N parallel subprocesses (default: 1, in-process). "
+                             "With pytest-xdist installed, 'pytest -n auto tests/' is the equivalent")
 
     args = parser.parse_args()
 
@@ -35,51 +95,53 @@ def main():
     run_unit = args.unit or not (args.unit or args.integration)
     run_integration = args.integration or not (args.unit or args.integration)
 
-    suite = unittest.TestSuite()
-    loader = unittest.TestLoader()
+    # Flat list of every loaded test, reused for counting, listing and running
+    all_tests = []
 
     try:
+        # Discover each test directory only when its tests were requested,
+        # so --unit never imports the integration modules
+        selected = []
         if run_unit:
-            from tests.unit.test_download_manager import TestDownloadManager
-            suite.addTests(loader.loadTestsFromTestCase(TestDownloadManager))
-            print("✓ Loaded unit tests (22 tests)")
-
-            if args.list:
-                print("\nUnit Tests:")
-                for method_name in dir(TestDownloadManager):
-                    if method_name.startswith("test_"):
-                        print(f"  - {method_name}")
-
+            selected.append(("unit", "Unit Tests", unit_tests_dir))
         if run_integration:
-            from tests.integration.test_download_script import TestDownloadScript
-            suite.addTests(loader.loadTestsFromTestCase(TestDownloadScript))
-            print("✓ Loaded integration tests (25 tests)")
+            selected.append(("integration", "Integration Tests", integration_tests_dir))
+
+        for kind, heading, start_dir in selected:
+            # A fresh loader per directory: discover() remembers its top-level dir
+            discovered = unittest.TestLoader().discover(str(start_dir), pattern="test_*.py")
+            tests = list(iter_tests(discovered))
+            all_tests.extend(tests)
+            print(f"✓ Loaded {kind} tests ({len(tests)} tests)")
 
             if args.list:
-                print("\nIntegration Tests:")
-                for method_name in dir(TestDownloadScript):
-                    if method_name.startswith("test_"):
-                        print(f"  - {method_name}")
+                print(f"\n{heading}:")
+                for test in tests:
+                    print(f"  - {test._testMethodName}")
 
     except ImportError as e:
         print(f"Error importing tests: {e}")
         return False
 
     if args.list:
-        print(f"\nTotal: {suite.countTestCases()} tests")
+        print(f"\nTotal: {len(all_tests)} tests")
         return True
 
-    if suite.countTestCases() == 0:
+    if not all_tests:
         print("No tests found.")
         return False
 
-    print(f"\nRunning {suite.countTestCases()} tests...")
+    print(f"\nRunning {len(all_tests)} tests...")
     print("=" * 60)
 
-    # Run tests
     verbosity = 2 if args.verbose else 1
-    runner = unittest.TextTestRunner(verbosity=verbosity)
-    result = runner.run(suite)
+    if args.jobs > 1:
+        return run_tests_parallel(all_tests, args.jobs, verbosity, args.failfast)
+
+    # Run tests
+    # buffer=True hides the output of passing tests
+    runner = unittest.TextTestRunner(verbosity=verbosity, failfast=args.failfast, buffer=True)
+    result = runner.run(unittest.TestSuite(all_tests))
 
     print("=" * 60)
     if result.wasSuccessful():
@@ -10,22 +10,45 @@ import os
 import unittest
 from pathlib import Path
 
+# Download manager test modules, importable once tests/ is on sys.path
+TEST_MODULES = (
+    "unit.test_download_manager",
+)
+
+# Set once setup_test_environment() has run in this interpreter
+_ENV_READY = False
+
 def setup_test_environment():
-    """Setup the Python path for testing."""
+    """Setup the Python path for testing (only the first call does any work)."""
+    global _ENV_READY
+    if _ENV_READY:
+        return
+
     # Get project root directory
     project_root = Path(__file__).parent.parent
     backend_dir = project_root / "backend"
     tests_dir = project_root / "tests"
 
-    # Add directories to Python path
-    sys.path.insert(0, str(backend_dir))
-    sys.path.insert(0, str(tests_dir))
+    # Add directories to Python path, skipping ones already present
+    for path in (str(backend_dir), str(tests_dir)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
 
     print(f"Project root: {project_root}")
     print(f"Backend directory: {backend_dir}")
     print(f"Tests directory: {tests_dir}")
     print(f"Python path: {sys.path[:3]}...")
     print()
+    _ENV_READY = True
+
+def xdist_available():
+    """Return True if pytest and the pytest-xdist plugin are installed."""
+    try:
+        import pytest  # noqa: F401
+        import xdist  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 def run_download_tests():
     """Run download manager unit tests."""
@@ -36,41 +59,73 @@ def run_download_tests():
     # Setup environment
     setup_test_environment()
 
-    # Discover and run tests
-    loader = unittest.TestLoader()
     start_dir = Path(__file__).parent / "unit"
-    suite = loader.discover(start_dir, pattern='test_download_*.py')
 
-    # Run tests with detailed output
+    # With pytest-xdist installed, spread the tests over every core. Each test
+    # works in its own temporary directory, so --dist=load can scatter
+    # individual tests rather than pinning whole modules to one worker.
+    if xdist_available():
+        import pytest
+        exit_code = pytest.main([
+            "-n", "auto", "--dist=load", "-p", "no:cacheprovider",
+            "-o", "python_files=test_download_*.py", str(start_dir)
+        ])
+        success = exit_code == 0
+        print(f"\nResult: {'PASSED' if success else 'FAILED'}")
+        return success
+
+    # Load the known test modules directly instead of walking the directory
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(loader.loadTestsFromName(name) for name in TEST_MODULES)
+
+    # When stderr is piped (CI, editors), collect runner output in a large
+    # buffer instead of flushing every test event; keep it live on a terminal
+    if sys.stderr.isatty():
+        stream = sys.stderr
+    else:
+        sys.stdout.flush()
+        stream = open(sys.stderr.fileno(), "w", buffering=1 << 16,
+                      encoding=sys.stderr.encoding, errors="replace", closefd=False)
+
+    # Run tests with detailed output. Test output is not captured per test
+    # (buffer=False): it goes straight to stdout instead of being held in memory
     runner = unittest.TextTestRunner(
+        stream=stream,
         verbosity=2,
         failfast=False,
-        buffer=True
+        buffer=False
     )
 
     result = runner.run(suite)
-
-    # Print summary
-    print("\n" + "=" * 60)
-    print("TEST SUMMARY")
-    print("=" * 60)
-    print(f"Tests run: {result.testsRun}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Skipped: {len(result.skipped)}")
+    if stream is sys.stderr:
+        stream.flush()
+    else:
+        stream.close()  # flushes; closefd=False leaves stderr itself open
+
+    # Write the summary and result in one call
+    summary = [
+        "\n" + "=" * 60,
+        "TEST SUMMARY",
+        "=" * 60,
+        f"Tests run: {result.testsRun}",
+        f"Failures: {len(result.failures)}",
+        f"Errors: {len(result.errors)}",
+        f"Skipped: {len(result.skipped)}",
+    ]
 
     if result.failures:
-        print("\nFAILURES:")
-        for test, traceback in result.failures:
-            print(f"  - {test}: {traceback.split('AssertionError:')[-1].strip()}")
+        summary.append("\nFAILURES:")
+        summary.extend(f"  - {test}: {traceback.split('AssertionError:')[-1].strip()}"
+                       for test, traceback in result.failures)
 
     if result.errors:
-        print("\nERRORS:")
-        for test, traceback in result.errors:
-            print(f"  - {test}: {traceback.split(':')[-1].strip()}")
+        summary.append("\nERRORS:")
+        summary.extend(f"  - {test}: {traceback.split(':')[-1].strip()}"
+                       for test, traceback in result.errors)
 
     success = len(result.failures) == 0 and len(result.errors) == 0
-    print(f"\nResult: {'PASSED' if success else 'FAILED'}")
+    summary.append(f"\nResult: {'PASSED' if success else 'FAILED'}")
+    sys.stdout.write("\n".join(summary) + "\n")
 
     return success
 
@@ -105,9 +160,8 @@ if __name__ == "__main__":
         from unit.test_download_manager import TestDownloadManager
 
         print("Available test methods:")
-        for method_name in dir(TestDownloadManager):
-            if method_name.startswith("test_"):
-                print(f"  - test_download_manager.TestDownloadManager.{method_name}")
+        for name in unittest.TestLoader().getTestCaseNames(TestDownloadManager):
+            print(f"  - test_download_manager.TestDownloadManager.{name}")
         sys.exit(0)
 
     # Run tests
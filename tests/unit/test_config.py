@@ -0,0 +1,165 @@
+"""
+Unit tests for the config module command line.
+
+The CLI is driven in-process through config.main(), with version discovery
+replaced by fixed lists so no test touches the network.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from io import StringIO
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend directory to path for imports
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+import config
+
+
+class TestConfigBasic(unittest.TestCase):
+    """Test cases for the configuration accessors."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Read the configuration once and share it across the tests."""
+        with redirect_stdout(StringIO()):
+            cls.cfg = config.load_config()
+        cls.lua_url = config.get_lua_url()
+        cls.luarocks_url = config.get_luarocks_url()
+        cls.lua_dir = config.get_lua_dir_name()
+        cls.luarocks_dir = config.get_luarocks_dir_name()
+        cls.filenames = config.get_download_filenames()
+
+    def test_load_config_returns_all_keys(self):
+        """Test that load_config() returns every supported key."""
+        self.assertIsInstance(self.cfg, dict)
+        for key in ('LUA_VERSION', 'LUA_MAJOR_MINOR', 'LUAROCKS_VERSION', 'LUAROCKS_PLATFORM'):
+            self.assertIn(key, self.cfg)
+
+    def test_urls_match_configured_versions(self):
+        """Test that the download URLs embed the configured versions."""
+        self.assertTrue(self.lua_url.endswith(f"lua-{config.LUA_VERSION}.tar.gz"))
+        self.assertTrue(self.luarocks_url.endswith(
+            f"luarocks-{config.LUAROCKS_VERSION}-{config.LUAROCKS_PLATFORM}.zip"))
+
+    def test_dir_names_match_download_filenames(self):
+        """Test that directory names and download filenames agree."""
+        self.assertEqual(self.filenames['lua'], f"{self.lua_dir}.tar.gz")
+        self.assertEqual(self.filenames['luarocks'], f"{self.luarocks_dir}.zip")
+        self.assertEqual(self.filenames['lua_tests'], f"{config.get_lua_tests_dir_name()}.tar.gz")
+
+
+class TestConfigCommandLine(unittest.TestCase):
+    """Test cases for config.main()."""
+
+    # Versions reported by the faked discovery
+    _LUA_VERSIONS = ["5.4.8", "5.4.7"]
+    _LUAROCKS_VERSIONS = ["3.12.2", "3.12.1"]
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory for the whole class."""
+        cls.temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove every test's cache file in one go."""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def setUp(self):
+        """Point the version cache at a fresh per-test file and fake discovery."""
+        self.cache_file = Path(self.temp_dir) / f"{self._testMethodName}.json"
+
+        patchers = [
+            patch.object(config, "CACHE_FILE", self.cache_file),
+            patch.object(config, "get_available_lua_versions",
+                         side_effect=lambda *args, **kwargs: list(self._LUA_VERSIONS)),
+            patch.object(config, "get_available_luarocks_versions",
+                         side_effect=lambda *args, **kwargs: list(self._LUAROCKS_VERSIONS)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_main(self, *argv):
+        """Run config.main() with argv and return (exit code, stdout)."""
+        buffer = StringIO()
+        with redirect_stdout(buffer):
+            exit_code = config.main(list(argv))
+        return exit_code, buffer.getvalue()
+
+    def test_help_lists_options(self):
+        """Test that --help prints the static help text with every option."""
+        for option in ("--check", "--discover", "--cache-info", "--clear-cache"):
+            self.assertIn(option, config._HELP_TEXT)
+        self.assertIn("Lua MSVC Build System", config._HELP_TEXT)
+
+        code, output = self.run_main("--help")
+        self.assertEqual(code, 0)
+        self.assertEqual(output, config._HELP_TEXT + "\n")
+
+    def test_discover_lifecycle(self):
+        """Test --discover creating, reusing and refreshing the cache in one sequence."""
+        # First run discovers and creates the cache
+        code, output = self.run_main("--discover")
+        self.assertEqual(code, 0)
+        self.assertTrue(self.cache_file.exists())
+        self.assertIn(f"Found {len(self._LUA_VERSIONS)} available Lua versions", output)
+        self.assertNotIn("Using cached data", output)
+
+        # Backdate the cache instead of sleeping, so a rewrite shows up in
+        # st_mtime regardless of the filesystem's timestamp resolution
+        backdated = self.cache_file.stat().st_mtime - 10.0
+        os.utime(self.cache_file, (backdated, backdated))
+
+        # Second run is served from the cache and leaves the file untouched
+        code, output = self.run_main("--discover")
+        self.assertEqual(code, 0)
+        self.assertIn("Using cached data", output)
+        self.assertEqual(self.cache_file.stat().st_mtime, backdated)
+
+        # --refresh rediscovers and rewrites the cache
+        code, output = self.run_main("--discover", "--refresh")
+        self.assertEqual(code, 0)
+        self.assertNotIn("Using cached data", output)
+        self.assertGreater(self.cache_file.stat().st_mtime, backdated)
+
+    def test_check_reports_unreachable_urls(self):
+        """Test that --check lists the URLs whose check failed."""
+        def fake_check(url, timeout=10):
+            if url == config.get_luarocks_url():
+                return False, "HTTP Error 404: Not Found"
+            return True, "OK (200)"
+
+        with patch.object(config, "check_url_exists", side_effect=fake_check), \
+             patch.object(config.time, "sleep"):
+            code, output = self.run_main("--check")
+
+        self.assertEqual(code, 0)
+        self.assertIn("Some URLs are not accessible", output)
+        self.assertIn("  - LuaRocks: HTTP Error 404: Not Found", output)
+        self.assertNotIn("  - Lua Source:", output)
+
+    def test_cache_expiry_behavior(self):
+        """Test that a cache older than CACHE_EXPIRY_HOURS is ignored."""
+        with redirect_stdout(StringIO()):
+            config.save_version_cache(self._LUA_VERSIONS, {'windows-64': self._LUAROCKS_VERSIONS})
+            self.assertEqual(config.load_version_cache(show_message=False)['lua_versions'],
+                             self._LUA_VERSIONS)
+
+            # Rewrite the cache with a timestamp past the expiry window
+            expired = datetime.now() - timedelta(hours=config.CACHE_EXPIRY_HOURS + 10)
+            config.save_version_cache(self._LUA_VERSIONS, {'windows-64': self._LUAROCKS_VERSIONS},
+                                      timestamp=expired.isoformat())
+            self.assertEqual(config.load_version_cache(show_message=False), {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,164 @@
+"""
+Unit tests for the setup_build module.
+
+copy_build_scripts() is run against a temporary extracted folder laid out
+like the real one, so the tests need neither downloaded sources nor MSVC.
+The build scripts themselves come from backend/build_scripts.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+from io import StringIO
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend directory to path for imports; under pytest conftest.py has
+# already done this, so only direct unittest runs need it
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import setup_build
+
+
+class TestSetupBuildReal(unittest.TestCase):
+    """Test cases for copy_build_scripts() with a complete extracted folder."""
+
+    def setUp(self):
+        """Create a temporary extracted folder with Lua and LuaRocks directories."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.extracted = Path(self.temp_dir) / "extracted"
+        self.lua_src = self.extracted / setup_build.get_lua_dir_name() / "src"
+        self.luarocks_dir = self.extracted / setup_build.get_luarocks_dir_name()
+        self.lua_src.mkdir(parents=True)
+        self.luarocks_dir.mkdir(parents=True)
+
+        patcher = patch.object(setup_build, "ensure_extracted_folder", return_value=self.extracted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def copy_scripts(self, build_dll=False, build_debug=False):
+        """Run copy_build_scripts() quietly and return its result."""
+        with redirect_stdout(StringIO()):
+            return setup_build.copy_build_scripts(build_dll, build_debug)
+
+    def run_main(self, argv):
+        """Run setup_build.main() quietly and return its exit code and output."""
+        output = StringIO()
+        with redirect_stdout(output):
+            exit_code = setup_build.main(argv)
+        return exit_code, output.getvalue()
+
+    def assertScriptsCopied(self, build_dll, build_debug):
+        """Assert the scripts for one build type match their templates."""
+        for name in setup_build.LUA_BUILD_SCRIPTS[(build_dll, build_debug)]:
+            copied = self.lua_src / name
+            self.assertTrue(copied.exists(), f"{name} was not copied")
+            self.assertEqual(copied.read_bytes(), (setup_build.BUILD_SCRIPTS_DIR / name).read_bytes())
+
+        luarocks_script = self.luarocks_dir / setup_build.LUAROCKS_SETUP_SCRIPT
+        self.assertTrue(luarocks_script.exists())
+
+    # ==========================================
+    # Build Script Copying
+    # ==========================================
+
+    def test_copy_build_scripts_static_release(self):
+        """Test static release build scripts are copied."""
+        self.assertTrue(self.copy_scripts())
+        self.assertScriptsCopied(False, False)
+        self.assertFalse((self.lua_src / "install_lua_dll.py").exists())
+
+    def test_copy_build_scripts_dll_release(self):
+        """Test DLL release build scripts are copied with the DLL installer."""
+        self.assertTrue(self.copy_scripts(build_dll=True))
+        self.assertScriptsCopied(True, False)
+        self.assertTrue((self.lua_src / "install_lua_dll.py").exists())
+
+    def test_copy_build_scripts_static_debug(self):
+        """Test static debug build scripts are copied."""
+        self.assertTrue(self.copy_scripts(build_debug=True))
+        self.assertScriptsCopied(False, True)
+
+    def test_copy_build_scripts_dll_debug(self):
+        """Test DLL debug build scripts are copied with the DLL installer."""
+        self.assertTrue(self.copy_scripts(build_dll=True, build_debug=True))
+        self.assertScriptsCopied(True, True)
+        self.assertTrue((self.lua_src / "install_lua_dll.py").exists())
+
+    def test_copy_build_scripts_overwrites_existing(self):
+        """Test a stale script in the destination is replaced."""
+        (self.lua_src / "build-static.bat").write_text("stale", encoding="utf-8")
+
+        self.assertTrue(self.copy_scripts())
+        self.assertScriptsCopied(False, False)
+
+    # ==========================================
+    # Command Line
+    # ==========================================
+
+    def test_main_dll_debug_flags(self):
+        """Test main() passes --dll and --debug through to copy_build_scripts."""
+        exit_code, output = self.run_main(["--dll", "--debug"])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("DLL Debug", output)
+        self.assertScriptsCopied(True, True)
+
+    def test_main_help(self):
+        """Test main() prints the usage for --help without copying anything."""
+        exit_code, output = self.run_main(["--help"])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Setup Build Scripts", output)
+        self.assertIn("--dll", output)
+        self.assertIn("--debug", output)
+        self.assertFalse((self.lua_src / "build-static.bat").exists())
+
+
+class TestSetupBuildMissingDirectories(unittest.TestCase):
+    """Test cases for copy_build_scripts() when the extracted folder is incomplete."""
+
+    def setUp(self):
+        """Create a temporary, empty extracted folder."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.extracted = Path(self.temp_dir) / "extracted"
+        self.lua_src = self.extracted / setup_build.get_lua_dir_name() / "src"
+        self.luarocks_dir = self.extracted / setup_build.get_luarocks_dir_name()
+        self.extracted.mkdir()
+
+        patcher = patch.object(setup_build, "ensure_extracted_folder", return_value=self.extracted)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def copy_scripts(self, build_dll=False, build_debug=False):
+        """Run copy_build_scripts() quietly and return its result."""
+        with redirect_stdout(StringIO()):
+            return setup_build.copy_build_scripts(build_dll, build_debug)
+
+    def test_missing_lua_directory(self):
+        """Test copy_build_scripts fails when the Lua source directory is missing."""
+        self.luarocks_dir.mkdir()
+
+        self.assertFalse(self.copy_scripts())
+        self.assertFalse((self.luarocks_dir / setup_build.LUAROCKS_SETUP_SCRIPT).exists())
+
+    def test_missing_luarocks_directory(self):
+        """Test copy_build_scripts fails when the LuaRocks directory is missing."""
+        self.lua_src.mkdir(parents=True)
+
+        self.assertFalse(self.copy_scripts())
+        self.assertFalse((self.lua_src / "build-static.bat").exists())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)